@@ -14,27 +14,37 @@ import sys
 import logging
 from pathlib import Path
 
-# Load environment variables
-from dotenv import load_dotenv
-load_dotenv()
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('logs/scraper.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
-# Ensure logs directory exists
-Path('logs').mkdir(exist_ok=True)
+# Commands whose output is also written to logs/scraper.log
+LOG_FILE_COMMANDS = ('run', 'schedule', 'serve')
+
+# Threads used to merge and save sources after a scrape
+RUN_WORKERS = 8
+
+
+def _bootstrap(log_to_file: bool = True):
+    """Load environment variables and set up logging before running a command."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    handlers = [logging.StreamHandler()]
+    if log_to_file:
+        # Ensure logs directory exists
+        Path('logs').mkdir(parents=True, exist_ok=True)
+        handlers.append(logging.FileHandler('logs/scraper.log'))
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
 
 
 def cmd_run(args):
     """Run the scraper once."""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     from src.scraper import Scraper
     from src.storage import Storage
     from src.deduplicator import Deduplicator
@@ -46,22 +56,32 @@ def cmd_run(args):
     deduplicator = Deduplicator(storage)
 
     # Scrape all sources
-    results = scraper.scrape_all()
+    results = asyncio.run(scraper.scrape_all_async())
+
+    def process_source(source_name, articles):
+        # Dedup in one pass and append only what is new
+        new_articles = deduplicator.filter_new_articles(source_name, articles)
+        storage.add_articles(source_name, new_articles)
+        deduplicator.record_stored(source_name, new_articles)
+        return source_name, len(articles), len(new_articles)
 
+    # Sources are independent and mostly disk-bound, so merge them in parallel
     total_new = 0
-    for source_name, articles in results.items():
-        if articles:
-            # Get count of truly new articles
-            new_count = len(articles) - deduplicator.get_duplicate_count(source_name, articles)
+    with ThreadPoolExecutor(max_workers=RUN_WORKERS) as executor:
+        futures = [
+            executor.submit(process_source, source_name, articles)
+            for source_name, articles in results.items()
+            if articles
+        ]
+        for future in as_completed(futures):
+            source_name, found, new_count = future.result()
             total_new += new_count
+            print(f"  {source_name}: {found} found, {new_count} new")
 
-            # Merge and save
-            merged = deduplicator.merge_articles(source_name, articles)
-            storage.save_articles(source_name, merged)
-            print(f"  {source_name}: {len(articles)} found, {new_count} new")
+    # Everything scraped is stored, so unchanged pages can be skipped next run
+    scraper.commit_validators()
 
-    # Update combined file
-    total = storage.update_combined_file()
+    total = storage.count_articles()
 
     print(f"\nScrape complete!")
     print(f"  Total articles: {total}")
@@ -173,6 +193,16 @@ def cmd_stats(args):
         print(f"  {source}: {count}")
 
 
+def cmd_dump(args):
+    """Export recent articles to a JSON file."""
+    from src.storage import Storage
+
+    storage = Storage()
+    count = storage.export_json(args.output)
+
+    print(f"Exported {count} articles to {args.output or storage.data_dir / 'all_articles.json'}")
+
+
 def cmd_test_email(args):
     """Send a test email to verify SendGrid configuration."""
     from src.newsletter import Newsletter
@@ -195,9 +225,9 @@ def cmd_test_email(args):
 
 def cmd_retag(args):
     """Re-tag all existing articles with stock impacts."""
+    import asyncio
     from src.storage import Storage
     from src.stock_tagger import StockTagger
-    import json
 
     storage = Storage()
     tagger = StockTagger()
@@ -211,27 +241,32 @@ def cmd_retag(args):
 
     print(f"Re-tagging {len(articles)} articles with stock impacts...")
 
-    tagged_count = 0
+    to_tag = []
     for i, article in enumerate(articles, 1):
         if article.get('impacted_stocks'):
             print(f"  {i}. Already tagged: {article['title'][:40]}...")
-            continue
-
-        print(f"  {i}. Tagging: {article['title'][:40]}...")
-        result = tagger.tag_article(article)
+        else:
+            to_tag.append((i, article))
+
+    to_tag_articles = [article for _, article in to_tag]
+    if args.batch:
+        # Message batches are half price but can take minutes to finish
+        print(f"Tagging {len(to_tag)} articles with message batches...")
+        results = tagger.tag_articles_batch(to_tag_articles, timeout=args.batch_timeout * 60)
+    else:
+        print(f"Tagging {len(to_tag)} articles with concurrent requests...")
+        results = asyncio.run(tagger.tag_articles_async(to_tag_articles))
 
-        article['tldr'] = result['tldr']
-        article['impacted_stocks'] = result['impacted_stocks']
-        tagged_count += 1
+    updates = []
+    for (i, article), result in zip(to_tag, results):
+        updates.append((article['id'], result['tldr'], result['impacted_stocks']))
 
         if result['impacted_stocks']:
             stocks = [s['ticker'] for s in result['impacted_stocks']]
-            print(f"      -> Stocks: {', '.join(stocks)}")
+            print(f"  {i}. -> Stocks: {', '.join(stocks)}")
 
-    # Save updated articles back to combined file
-    combined_file = storage._get_combined_file()
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, indent=2, ensure_ascii=False)
+    # Save tags without rewriting the article files
+    tagged_count = storage.update_article_tags(updates)
 
     print(f"\nDone! Tagged {tagged_count} articles.")
 
@@ -246,56 +281,61 @@ def main():
 
     # Run command
     run_parser = subparsers.add_parser('run', help='Run scraper once')
+    run_parser.set_defaults(func=cmd_run)
 
     # Serve command
     serve_parser = subparsers.add_parser('serve', help='Start web server')
     serve_parser.add_argument('--host', default='0.0.0.0', help='Host to bind to')
     serve_parser.add_argument('--port', type=int, default=8000, help='Port to listen on')
     serve_parser.add_argument('--reload', action='store_true', help='Enable auto-reload')
+    serve_parser.set_defaults(func=cmd_serve)
 
     # Schedule command
     schedule_parser = subparsers.add_parser('schedule', help='Start scheduler daemon')
     schedule_parser.add_argument('--interval', type=int, help='Scrape interval in hours')
+    schedule_parser.set_defaults(func=cmd_schedule)
 
     # List command
     list_parser = subparsers.add_parser('list', help='List recent articles')
     list_parser.add_argument('--source', help='Filter by source name')
     list_parser.add_argument('--limit', type=int, default=20, help='Number of articles')
+    list_parser.set_defaults(func=cmd_list)
 
     # Search command
     search_parser = subparsers.add_parser('search', help='AI-powered search')
     search_parser.add_argument('query', nargs='+', help='Search query')
+    search_parser.set_defaults(func=cmd_search)
 
     # Stats command
     stats_parser = subparsers.add_parser('stats', help='Show statistics')
+    stats_parser.set_defaults(func=cmd_stats)
+
+    # Dump command
+    dump_parser = subparsers.add_parser('dump', help='Export articles to JSON')
+    dump_parser.add_argument('--output', help='Output file (default: data/articles/all_articles.json)')
+    dump_parser.set_defaults(func=cmd_dump)
 
     # Test email command
     test_email_parser = subparsers.add_parser('test-email', help='Send test email')
+    test_email_parser.set_defaults(func=cmd_test_email)
 
     # Retag command
     retag_parser = subparsers.add_parser('retag', help='Re-tag articles with stock impacts')
     retag_parser.add_argument('--limit', type=int, default=50, help='Number of articles to tag')
+    retag_parser.add_argument('--batch', action='store_true',
+                              help='Use the cheaper but slower message batch API instead of concurrent requests')
+    retag_parser.add_argument('--batch-timeout', type=int, default=60,
+                              help='Minutes to wait for message batches before cancelling them')
+    retag_parser.set_defaults(func=cmd_retag)
 
     args = parser.parse_args()
 
-    if args.command == 'run':
-        cmd_run(args)
-    elif args.command == 'serve':
-        cmd_serve(args)
-    elif args.command == 'schedule':
-        cmd_schedule(args)
-    elif args.command == 'list':
-        cmd_list(args)
-    elif args.command == 'search':
-        cmd_search(args)
-    elif args.command == 'stats':
-        cmd_stats(args)
-    elif args.command == 'test-email':
-        cmd_test_email(args)
-    elif args.command == 'retag':
-        cmd_retag(args)
-    else:
+    if not hasattr(args, 'func'):
         parser.print_help()
+        return
+
+    _bootstrap(log_to_file=args.command in LOG_FILE_COMMANDS)
+    args.func(args)
 
 
 if __name__ == '__main__':
@@ -1,54 +1,84 @@
-import os
+import io
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional
 from anthropic import Anthropic
 
+from .llm_cache import LLMCache
+from .llm_client import get_client
 from .storage import Storage
 
 logger = logging.getLogger(__name__)
 
+# Per-article block of the search context
+_CONTEXT_TEMPLATE = """
+---
+Title: {title}
+Source: {source_name}
+Date: {published_date}
+URL: {url}
+Summary: {summary}
+---"""
+
+_CONTEXT_DEFAULTS = {
+    'title': 'Untitled',
+    'url': '',
+    'summary': 'No summary available.',
+}
+
+
+class _ContextFields(dict):
+    """Article fields for the context template, with defaults for missing keys."""
+
+    def __missing__(self, key: str) -> str:
+        return _CONTEXT_DEFAULTS.get(key, 'Unknown')
+
 
 class AISearch:
     """Claude-powered intelligent search across scraped articles."""
 
     def __init__(self, storage: Storage = None):
         self.storage = storage or Storage()
-        self.client = None
-        self._init_client()
+        self.cache = LLMCache()
+        # Built contexts keyed by (data version, max_articles)
+        self._context_cache: dict[tuple[int, int], tuple[str, int]] = {}
 
-    def _init_client(self):
-        """Initialize Anthropic client."""
-        api_key = os.getenv('ANTHROPIC_API_KEY')
-        if not api_key:
-            logger.warning("ANTHROPIC_API_KEY not set. AI search will be disabled.")
-            return
-
-        self.client = Anthropic(api_key=api_key)
+    @property
+    def client(self) -> Optional[Anthropic]:
+        """Shared Anthropic client, created on first use."""
+        return get_client()
 
     def is_available(self) -> bool:
         """Check if AI search is available."""
         return self.client is not None
 
-    def _build_context(self, max_articles: int = 100) -> str:
-        """Build context string from recent articles."""
-        articles = self.storage.get_recent_articles(limit=max_articles)
-
-        if not articles:
-            return "No articles available."
-
-        context_parts = []
-        for article in articles:
-            part = f"""
----
-Title: {article.get('title', 'Untitled')}
-Source: {article.get('source_name', 'Unknown')}
-Date: {article.get('published_date', 'Unknown')}
-URL: {article.get('url', '')}
-Summary: {article.get('summary', 'No summary available.')}
----"""
-            context_parts.append(part)
-
-        return "\n".join(context_parts)
+    def _build_context(self, max_articles: int = 100) -> tuple[str, int]:
+        """Build context string from recent articles, along with the number of articles used."""
+        buf = io.StringIO()
+        count = 0
+
+        for article in self.storage.iter_recent_articles(limit=max_articles):
+            if count:
+                buf.write("\n")
+            buf.write(_CONTEXT_TEMPLATE.format_map(_ContextFields(article)))
+            count += 1
+
+        if not count:
+            return "No articles available.", 0
+
+        return buf.getvalue(), count
+
+    def _build_context_cached(self, max_articles: int, version: Optional[int]) -> tuple[str, int]:
+        """Build context for a given version of the stored articles, reusing earlier results."""
+        key = (version, max_articles)
+        cached = self._context_cache.get(key)
+        if cached is None:
+            cached = self._build_context(max_articles)
+            if version is not None:
+                # Contexts built from older versions are stale once the articles change
+                self._context_cache = {k: v for k, v in self._context_cache.items() if k[0] == version}
+                self._context_cache[key] = cached
+        return cached
 
     def search(self, query: str, max_articles: int = 100) -> dict:
         """
@@ -68,8 +98,9 @@ Summary: {article.get('summary', 'No summary available.')}
                 "error": "API key not configured"
             }
 
-        # Build context from articles
-        context = self._build_context(max_articles)
+        # Build context from articles (cached until the stored articles change)
+        version = self.storage.get_data_version()
+        context, articles_searched = self._build_context_cached(max_articles, version)
 
         # Build the prompt
         system_prompt = """You are an AI assistant helping users explore and understand news about AI companies, foundational model labs, and SaaS startups.
@@ -90,23 +121,29 @@ User's question: {query}
 Please answer based on the articles above. If the answer isn't in these articles, let me know."""
 
         try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1024,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_message}
-                ]
-            )
-
-            answer = response.content[0].text
+            answer = self.cache.get(query, version, max_articles)
+            cached = answer is not None
+
+            if not cached:
+                response = self.client.messages.create(
+                    model="claude-sonnet-4-20250514",
+                    max_tokens=1024,
+                    system=system_prompt,
+                    messages=[
+                        {"role": "user", "content": user_message}
+                    ]
+                )
+
+                answer = response.content[0].text
+                self.cache.set(query, version, max_articles, answer)
 
             return {
                 "success": True,
                 "response": answer,
-                "articles_searched": len(self.storage.get_recent_articles(limit=max_articles)),
+                "cached": cached,
+                "articles_searched": articles_searched,
                 "query": query,
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
             }
 
         except Exception as e:
@@ -0,0 +1,109 @@
+import hashlib
+import logging
+import math
+import mmap
+import struct
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# On-disk layout: magic, bit count, hash count, item capacity and the
+# (insert count, item count) stamp - how many stores had added to the source
+# when the filter was saved, and how many URLs it holds - followed by the raw
+# bit array.
+_HEADER = struct.Struct('<4sQIQqq')
+_MAGIC = b'BLM3'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over a bit array, persistable to a flat file."""
+
+    def __init__(self, num_bits: int, num_hashes: int, capacity: int, bits=None,
+                 offset: int = 0, stamp: tuple[int, int] = (0, 0)):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.capacity = capacity
+        self.stamp = stamp
+        self._bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        self._offset = offset
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 1e-7) -> 'BloomFilter':
+        """Create a filter sized for `capacity` items at the given false positive rate."""
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes, capacity)
+
+    def _positions(self, item: str):
+        """Yield bit positions for an item using double hashing."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        """Add an item to the filter."""
+        bits, offset = self._bits, self._offset
+        for pos in self._positions(item):
+            bits[offset + (pos >> 3)] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits, offset = self._bits, self._offset
+        return all(bits[offset + (pos >> 3)] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def _view(self) -> memoryview:
+        """The filter's bit array, without any file header in front of it."""
+        return memoryview(self._bits)[self._offset:self._offset + (self.num_bits + 7) // 8]
+
+    def copy(self) -> 'BloomFilter':
+        """Return a writable copy of the filter."""
+        return BloomFilter(self.num_bits, self.num_hashes, self.capacity,
+                           bits=bytearray(self._view), stamp=self.stamp)
+
+    def freeze(self) -> 'BloomFilter':
+        """Make the bit array read-only so the filter can be shared safely."""
+        if isinstance(self._bits, bytearray):
+            self._bits = bytes(self._bits)
+        return self
+
+    def save(self, path: Path, stamp: tuple[int, int]):
+        """Write the filter to disk atomically, tagged with its (insert count, item count) stamp."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = _HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.capacity, *stamp)
+
+        try:
+            temp_path = path.with_suffix('.tmp')
+            with open(temp_path, 'wb') as f:
+                f.write(header)
+                f.write(self._view)
+            temp_path.replace(path)
+            self.stamp = stamp
+        except OSError as e:
+            logger.warning(f"Error saving bloom filter to {path}: {e}")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['BloomFilter']:
+        """Memory-map a saved filter read-only, or return None if missing or unreadable."""
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                bits = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Error loading bloom filter {path}: {e}")
+            return None
+
+        if len(bits) < _HEADER.size:
+            return None
+
+        magic, num_bits, num_hashes, capacity, inserts, items = _HEADER.unpack_from(bits)
+        if magic != _MAGIC or len(bits) < _HEADER.size + (num_bits + 7) // 8:
+            return None
+
+        return cls(num_bits, num_hashes, capacity, bits=bits, offset=_HEADER.size,
+                   stamp=(inserts, items))
@@ -1,47 +1,244 @@
 import logging
-from typing import Set
+import threading
+from pathlib import Path
+from typing import Optional, Set
 
+import numpy as np
+from datasketch import LeanMinHash, MinHash, MinHashLSH
+
+from .bloom import BloomFilter
 from .parsers.base import Article
 from .storage import Storage
+from .url_norm import normalize
 
 logger = logging.getLogger(__name__)
 
+# False positive rate for the persisted URL filters
+BLOOM_ERROR_RATE = 1e-7
+
+# Filters are sized with headroom so stored articles can be added to them in place
+BLOOM_MIN_CAPACITY = 1000
+
+# Bump when the way URLs are keyed changes, so persisted filters are rebuilt
+URL_KEY_VERSION = 2
+
+# Near-duplicate detection over title + summary
+NEAR_DUPLICATE_THRESHOLD = 0.85
+MINHASH_PERMUTATIONS = 128
+SHINGLE_SIZE = 5
+# Pinned so persisted signatures stay comparable across datasketch upgrades
+MINHASH_SCHEME = 'affine32'
+MINHASH_SEED = 1
+
+
+def _is_valid_date(date: Optional[str]) -> bool:
+    """Check if a date value is present and not a placeholder."""
+    if not date:
+        return False
+    if date == '1970-01-01' or str(date).startswith('1970'):
+        return False
+    return True
+
+
+class SeenUrls:
+    """
+    Normalized URL membership for a source.
+
+    Stored URLs live in an immutable Bloom filter snapshot; URLs added this
+    session go into a separate delta set, so the snapshot is never mutated.
+    """
+
+    def __init__(self, snapshot: BloomFilter):
+        self.snapshot = snapshot
+        self.delta: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.delta or url in self.snapshot
+
+    def add(self, url: str) -> bool:
+        """Record a URL seen this session, returning False if it was already known."""
+        with self._lock:
+            if url in self:
+                return False
+            self.delta.add(url)
+            return True
+
 
 class Deduplicator:
     """Handles deduplication of articles to prevent storing duplicates."""
 
-    def __init__(self, storage: Storage):
+    def __init__(self, storage: Storage, bloom_dir: str = "data/bloom"):
         self.storage = storage
-        self._url_cache: dict[str, Set[str]] = {}
+        self.bloom_dir = Path(bloom_dir)
+        self._url_cache: dict[str, SeenUrls] = {}
+        self._lsh_cache: dict[str, MinHashLSH] = {}
+        self._minhash_cache: dict[str, MinHash] = {}  # keyed by article id
+        # Writable copies of the persisted filters, updated as articles are stored
+        self._stored_blooms: dict[str, BloomFilter] = {}
+        # Sources can be processed on separate threads; each gets its own lock
+        self._cache_locks: dict[str, threading.RLock] = {}
 
-    def _get_existing_urls(self, source_name: str) -> Set[str]:
-        """Get set of existing article URLs for a source."""
-        if source_name not in self._url_cache:
-            existing = self.storage.load_articles(source_name)
-            self._url_cache[source_name] = {a.get('url', '') for a in existing}
-        return self._url_cache[source_name]
+    def _lock_for(self, source_name: str) -> threading.RLock:
+        """Get the lock guarding a source's cache entries."""
+        lock = self._cache_locks.get(source_name)
+        if lock is None:
+            lock = self._cache_locks.setdefault(source_name, threading.RLock())
+        return lock
 
-    def _has_valid_date(self, article: Article) -> bool:
-        """Check if article has a valid date."""
-        date = article.published_date or article.scraped_at
-        if not date:
+    def _bloom_path(self, source_name: str) -> Path:
+        """Path of a source's persisted URL filter."""
+        return self.bloom_dir / f"{source_name}.v{URL_KEY_VERSION}.bf"
+
+    def _load_bloom(self, source_name: str) -> BloomFilter:
+        """
+        Load the source's persisted URL filter, rebuilding it if articles were added elsewhere.
+
+        The filter is stamped with the source's insert count, so cleanup
+        deleting old articles doesn't invalidate it; URLs of deleted articles
+        left in the filter only keep those articles from being stored again.
+        """
+        bloom_path = self._bloom_path(source_name)
+        insert_count = self.storage.get_insert_count(source_name)
+
+        if insert_count is not None:
+            bloom = BloomFilter.load(bloom_path)
+            if bloom and bloom.stamp[0] == insert_count:
+                return bloom
+
+        urls = self.storage.load_urls(source_name)
+        bloom = BloomFilter.for_capacity(max(2 * len(urls), BLOOM_MIN_CAPACITY), BLOOM_ERROR_RATE)
+        for url in urls:
+            bloom.add(normalize(url))
+
+        if insert_count is not None:
+            bloom.save(bloom_path, (insert_count, len(urls)))
+        return bloom.freeze()
+
+    def _get_existing_urls(self, source_name: str) -> SeenUrls:
+        """Get the set of existing article URLs for a source."""
+        with self._lock_for(source_name):
+            if source_name not in self._url_cache:
+                self._url_cache[source_name] = SeenUrls(self._load_bloom(source_name))
+            return self._url_cache[source_name]
+
+    def record_stored(self, source_name: str, articles: list[Article]):
+        """
+        Add just-stored articles to the source's persisted URL filter and signatures.
+
+        Call after the articles are stored. The filter is re-saved under the
+        source's new insert count only if that store was the only one to add
+        articles since the filter was stamped and it still has capacity;
+        otherwise it is left stale and rebuilt on the next run.
+        """
+        if not articles:
+            return
+
+        self.storage.set_minhashes(source_name, [
+            (a.id, self._minhash(a.id, a.title, a.summary).hashvalues.tobytes()) for a in articles
+        ])
+
+        with self._lock_for(source_name):
+            bloom = self._stored_blooms.pop(source_name, None)
+            if bloom is None:
+                bloom = self._get_existing_urls(source_name).snapshot.copy()
+
+            for a in articles:
+                bloom.add(normalize(a.url))
+
+            insert_count = self.storage.get_insert_count(source_name)
+            stamp = (insert_count, bloom.stamp[1] + len(articles))
+            if insert_count == bloom.stamp[0] + 1 and stamp[1] <= bloom.capacity:
+                bloom.save(self._bloom_path(source_name), stamp)
+                if bloom.stamp == stamp:
+                    self._stored_blooms[source_name] = bloom
+
+    def _minhash(self, article_id: str, title: str, summary: Optional[str]) -> MinHash:
+        """Get the MinHash signature of an article's title and summary shingles."""
+        if article_id not in self._minhash_cache:
+            tokens = f"{title} {summary or ''}".lower().split()
+            shingles = {
+                " ".join(tokens[i:i + SHINGLE_SIZE])
+                for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))
+            }
+            minhash = MinHash(num_perm=MINHASH_PERMUTATIONS, seed=MINHASH_SEED, scheme=MINHASH_SCHEME)
+            minhash.update_batch([s.encode() for s in shingles])
+            self._minhash_cache[article_id] = minhash
+        return self._minhash_cache[article_id]
+
+    def _get_lsh(self, source_name: str) -> MinHashLSH:
+        """Get the LSH index of existing article signatures for a source."""
+        with self._lock_for(source_name):
+            if source_name not in self._lsh_cache:
+                lsh = MinHashLSH(threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=MINHASH_PERMUTATIONS)
+                signed, unsigned = self.storage.load_minhashes(source_name)
+
+                # Stored signatures only need wrapping, not rehashing
+                for article_id, hashvalues in signed:
+                    lsh.insert(article_id, LeanMinHash(
+                        seed=MINHASH_SEED, scheme=MINHASH_SCHEME,
+                        hashvalues=np.frombuffer(hashvalues, dtype=np.uint32)
+                    ))
+
+                # Articles stored before signatures were kept are hashed once and saved
+                backfill = []
+                for a in unsigned:
+                    minhash = self._minhash(a['id'], a.get('title', ''), a.get('summary'))
+                    lsh.insert(a['id'], minhash)
+                    backfill.append((a['id'], minhash.hashvalues.tobytes()))
+                self.storage.set_minhashes(source_name, backfill)
+
+                self._lsh_cache[source_name] = lsh
+            return self._lsh_cache[source_name]
+
+    def _is_near_duplicate(self, source_name: str, article: Article) -> bool:
+        """Check if an article's content closely matches an existing article."""
+        minhash = self._minhash(article.id, article.title, article.summary)
+        return bool(self._get_lsh(source_name).query(minhash))
+
+    def _is_duplicate(self, source_name: str, article: Article, existing_urls: SeenUrls) -> bool:
+        """Check if an article is an exact-URL or near duplicate of a known article."""
+        return normalize(article.url) in existing_urls or self._is_near_duplicate(source_name, article)
+
+    def _claim(self, source_name: str, article: Article, existing_urls: SeenUrls) -> bool:
+        """
+        Record an article as seen this session.
+
+        Returns:
+            True if the article was new, False if it duplicates a known article
+        """
+        # The URL check is a few bit probes, so it runs before any hashing
+        if self._is_duplicate(source_name, article, existing_urls):
             return False
-        if date == '1970-01-01' or str(date).startswith('1970'):
+        if not existing_urls.add(normalize(article.url)):
             return False
+
+        lsh = self._get_lsh(source_name)
+        if article.id not in lsh:
+            lsh.insert(article.id, self._minhash(article.id, article.title, article.summary))
         return True
 
-    def filter_new_articles(self, source_name: str, articles: list[Article]) -> list[Article]:
+    def _has_valid_date(self, article: Article) -> bool:
+        """Check if article has a valid date."""
+        return _is_valid_date(article.published_date or article.scraped_at)
+
+    def filter_new_articles(self, source_name: str, articles: list[Article],
+                            existing_urls: Optional[SeenUrls] = None) -> list[Article]:
         """
-        Filter out articles that already exist in storage or don't have valid dates.
+        Filter out articles that already exist in storage (by URL or near-duplicate
+        content) or don't have valid dates.
 
         Args:
             source_name: Name of the source
             articles: List of newly scraped articles
+            existing_urls: Precomputed URL set for the source, if already loaded
 
         Returns:
             List of articles that are new (not already stored) and have valid dates
         """
-        existing_urls = self._get_existing_urls(source_name)
+        if existing_urls is None:
+            existing_urls = self._get_existing_urls(source_name)
+
         new_articles = []
         no_date_count = 0
 
@@ -51,73 +248,26 @@ class Deduplicator:
                 no_date_count += 1
                 continue
 
-            if article.url not in existing_urls:
+            # Claiming adds the URL to the session cache so later checks see it
+            if self._claim(source_name, article, existing_urls):
                 new_articles.append(article)
-                # Add to cache so subsequent calls in same session see it
-                existing_urls.add(article.url)
 
         skipped = len(articles) - len(new_articles) - no_date_count
         if skipped > 0:
-            logger.info(f"Filtered out {skipped} duplicate articles for {source_name}")
+            logger.info("Filtered out %d duplicate articles for %s", skipped, source_name)
         if no_date_count > 0:
-            logger.info(f"Filtered out {no_date_count} articles without dates for {source_name}")
+            logger.info("Filtered out %d articles without dates for %s", no_date_count, source_name)
 
         return new_articles
 
-    def merge_articles(self, source_name: str, new_articles: list[Article]) -> list[Article]:
+    def clear_cache(self):
         """
-        Merge new articles with existing ones, maintaining order.
-        Only keeps articles with valid dates.
+        Clear the URL and signature caches to force reload from storage.
 
-        Args:
-            source_name: Name of the source
-            new_articles: List of new articles to add
-
-        Returns:
-            Combined list with new articles first, then existing (all with valid dates)
+        Call at the end of a scrape cycle so URLs added this session are folded
+        into fresh snapshots of the saved articles.
         """
-        # Load existing articles as Article objects
-        existing_dicts = self.storage.load_articles(source_name)
-
-        # Filter out duplicates and articles without dates from new articles
-        new_filtered = self.filter_new_articles(source_name, new_articles)
-
-        # Convert existing to Article objects and filter out those without dates
-        existing_articles = [self._dict_to_article(d) for d in existing_dicts]
-        existing_with_dates = [a for a in existing_articles if self._has_valid_date(a)]
-
-        removed_no_date = len(existing_articles) - len(existing_with_dates)
-        if removed_no_date > 0:
-            logger.info(f"Removed {removed_no_date} existing articles without dates for {source_name}")
-
-        if not new_filtered:
-            logger.info(f"No new articles to add for {source_name}")
-            return existing_with_dates
-
-        # Combine: new articles first, then existing
-        combined = new_filtered + existing_with_dates
-
-        logger.info(f"Added {len(new_filtered)} new articles for {source_name}")
-        return combined
-
-    def _dict_to_article(self, d: dict) -> Article:
-        """Convert dictionary back to Article object."""
-        return Article(
-            id=d.get('id', ''),
-            title=d.get('title', ''),
-            url=d.get('url', ''),
-            source=d.get('source', ''),
-            source_name=d.get('source_name', ''),
-            published_date=d.get('published_date'),
-            summary=d.get('summary'),
-            scraped_at=d.get('scraped_at', '')
-        )
-
-    def clear_cache(self):
-        """Clear the URL cache to force reload from storage."""
         self._url_cache.clear()
-
-    def get_duplicate_count(self, source_name: str, articles: list[Article]) -> int:
-        """Get count of how many articles are duplicates."""
-        existing_urls = self._get_existing_urls(source_name)
-        return sum(1 for a in articles if a.url in existing_urls)
+        self._lsh_cache.clear()
+        self._minhash_cache.clear()
+        self._stored_blooms.clear()
@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# How long cached responses stay valid (seconds)
+CACHE_TTL_SECONDS = 3600
+
+# Minimum cosine similarity for a semantic cache hit
+SEMANTIC_SIMILARITY_THRESHOLD = 0.92
+
+# Local embedding model used by the semantic tier
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+# Recent query embeddings kept so a miss in get() and the set() after it embed once
+EMBEDDING_MEMO_SIZE = 64
+
+
+class LLMCache:
+    """Caches LLM responses by exact query, with optional semantic matching."""
+
+    def __init__(self, db_path: str = "data/llm_cache.db", ttl_seconds: int = CACHE_TTL_SECONDS,
+                 semantic: Optional[bool] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+
+        # Semantic matching can return answers to differently-worded questions,
+        # so it is opt-in
+        if semantic is None:
+            semantic = os.getenv('LLM_CACHE_SEMANTIC', 'false').lower() in ('1', 'true', 'yes')
+        self.semantic = semantic
+        self._embedder = None
+        self._embeddings: dict[str, object] = {}
+        self._embeddings_lock = threading.Lock()
+
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database."""
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        """Create the cache table if it doesn't exist."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        scope TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        embedding BLOB,
+                        created_at REAL NOT NULL
+                    )"""
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_scope ON responses(scope)")
+        except sqlite3.Error as e:
+            logger.error(f"Error initializing LLM cache: {e}")
+
+    @staticmethod
+    def _hash(payload: dict) -> str:
+        """Get a SHA-256 key for a JSON-serializable payload."""
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def _embed(self, query: str):
+        """Embed a query for the semantic tier, or return None if unavailable."""
+        if not self.semantic:
+            return None
+
+        if self._embedder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                logger.warning("sentence-transformers not installed. Semantic LLM cache disabled.")
+                self.semantic = False
+                return None
+            self._embedder = SentenceTransformer(EMBEDDING_MODEL)
+
+        with self._embeddings_lock:
+            embedding = self._embeddings.get(query)
+        if embedding is not None:
+            return embedding
+
+        embedding = self._embedder.encode(query, normalize_embeddings=True).astype('float32')
+        with self._embeddings_lock:
+            if len(self._embeddings) >= EMBEDDING_MEMO_SIZE:
+                del self._embeddings[next(iter(self._embeddings))]
+            self._embeddings[query] = embedding
+        return embedding
+
+    def get(self, query: str, version: Optional[int], max_articles: int) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            query: The user's query
+            version: Version of the article corpus the response was generated from
+            max_articles: Number of articles included in the context
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        key = self._hash({"query": query, "version": version, "max_articles": max_articles})
+        scope = self._hash({"version": version, "max_articles": max_articles})
+        cutoff = time.time() - self.ttl_seconds
+
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created_at > ?",
+                    (key, cutoff)
+                ).fetchone()
+                if row:
+                    return row[0]
+
+                embedding = self._embed(query)
+                if embedding is None:
+                    return None
+
+                rows = conn.execute(
+                    "SELECT response, embedding FROM responses "
+                    "WHERE scope = ? AND created_at > ? AND embedding IS NOT NULL",
+                    (scope, cutoff)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading LLM cache: {e}")
+            return None
+
+        if not rows:
+            return None
+
+        import numpy as np
+
+        matrix = np.frombuffer(b"".join(r[1] for r in rows), dtype='float32').reshape(len(rows), -1)
+        scores = matrix @ embedding
+        best = int(scores.argmax())
+        if scores[best] >= SEMANTIC_SIMILARITY_THRESHOLD:
+            logger.info(f"Semantic cache hit (similarity {scores[best]:.3f})")
+            return rows[best][0]
+        return None
+
+    def set(self, query: str, version: Optional[int], max_articles: int, response: str):
+        """Store a response for a query against a given corpus version."""
+        key = self._hash({"query": query, "version": version, "max_articles": max_articles})
+        scope = self._hash({"version": version, "max_articles": max_articles})
+        embedding = self._embed(query)
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, scope, response, embedding, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, scope, response, embedding.tobytes() if embedding is not None else None, time.time())
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE created_at <= ?",
+                    (time.time() - self.ttl_seconds,)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error writing LLM cache: {e}")
@@ -0,0 +1,39 @@
+import os
+import logging
+import threading
+from typing import Optional
+
+from anthropic import Anthropic
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[Anthropic] = None
+_client_checked = False
+_client_lock = threading.Lock()
+
+
+def get_client() -> Optional[Anthropic]:
+    """
+    Get the process-wide Anthropic client, creating it on first use.
+
+    Sharing one client keeps its connection pool warm, so repeated calls skip
+    the TCP and TLS handshakes.
+
+    Returns:
+        Shared client, or None if ANTHROPIC_API_KEY isn't set
+    """
+    global _client, _client_checked
+
+    if _client_checked:
+        return _client
+
+    with _client_lock:
+        if not _client_checked:
+            api_key = os.getenv('ANTHROPIC_API_KEY')
+            if api_key:
+                _client = Anthropic(api_key=api_key)
+            else:
+                logger.warning("ANTHROPIC_API_KEY not set. Claude features will be disabled.")
+            _client_checked = True
+
+    return _client
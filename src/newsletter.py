@@ -1,21 +1,84 @@
 import os
+import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 import base64
 
+from functools import lru_cache
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from markupsafe import Markup
+
 logger = logging.getLogger(__name__)
 
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Bulk sends: concurrent requests, recipients per group, and pause between groups (seconds)
+BULK_SEND_WORKERS = 10
+BULK_SEND_GROUP_SIZE = 200
+BULK_SEND_GROUP_DELAY = 1
+
+# SendGrid accepts at most 1000 personalizations per request; large bodies use
+# smaller batches to keep each request well under the payload size limit
+BROADCAST_BATCH_SIZE = 1000
+BROADCAST_LARGE_BODY = 900_000
+BROADCAST_LARGE_BATCH_SIZE = 100
+
+# Compiled once per process; templates ship with the code, so skip reload checks
+_env = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=select_autoescape(['html', 'j2']),
+    auto_reload=False
+)
+
+
+@lru_cache(maxsize=128)
+def _source_badge(source: str) -> Markup:
+    """Render the source label for an article card, reused across articles from the same source."""
+    return Markup(
+        '<span style="background: #f3f4f6; color: #4b5563; padding: 4px 12px; border-radius: 20px; '
+        'font-size: 12px; font-weight: 500;">{}</span>'
+    ).format(source)
+
+
+_env.filters['source_badge'] = _source_badge
+
 # SendGrid import - will fail gracefully if not installed
 try:
     from sendgrid import SendGridAPIClient
-    from sendgrid.helpers.mail import Mail, Email, To, Content, HtmlContent
+    from sendgrid.helpers.mail import Mail, Email, To, Content, HtmlContent, Personalization
     SENDGRID_AVAILABLE = True
 except ImportError:
     SENDGRID_AVAILABLE = False
     logger.warning("SendGrid not installed. Run: pip install sendgrid")
 
 
+# SendGrid client shared by every Newsletter in the process
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
+
+def _get_client(api_key: str):
+    """Get the shared SendGrid client for an API key, creating it on first use."""
+    global _client, _client_key
+
+    with _client_lock:
+        if _client is None or _client_key != api_key:
+            _client = SendGridAPIClient(api_key)
+            _client_key = api_key
+        return _client
+
+
+def _get_template() -> Template:
+    """Get the compiled newsletter template."""
+    return _env.get_template('newsletter.html.j2')
+
+
 class Newsletter:
     """Sends email newsletters with AI news updates."""
 
@@ -26,7 +89,7 @@ class Newsletter:
         self.client = None
 
         if SENDGRID_AVAILABLE and self.api_key:
-            self.client = SendGridAPIClient(self.api_key)
+            self.client = _get_client(self.api_key)
 
     def is_available(self) -> bool:
         """Check if newsletter sending is available."""
@@ -34,116 +97,10 @@ class Newsletter:
 
     def _generate_html(self, articles: list[dict], date_str: str) -> str:
         """Generate HTML email content in TLDR AI style."""
+        return _get_template().render(articles=articles, date_str=date_str, count=len(articles))
 
-        # Build articles HTML
-        articles_html = ""
-        for i, article in enumerate(articles, 1):
-            title = article.get('title', 'Untitled')
-            url = article.get('url', '#')
-            source = article.get('source_name', 'Unknown')
-            tldr = article.get('tldr', article.get('summary', 'No summary available.')[:200])
-            impacted_stocks = article.get('impacted_stocks', [])
-
-            # Build stocks badges
-            stocks_html = ""
-            if impacted_stocks:
-                stocks_badges = " ".join([
-                    f'<span style="display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 2px 8px; border-radius: 12px; font-size: 11px; margin-right: 4px; margin-bottom: 4px;">{s["ticker"]}</span>'
-                    for s in impacted_stocks
-                ])
-                stocks_html = f'''
-                <div style="margin-top: 8px;">
-                    <span style="color: #6b7280; font-size: 12px; margin-right: 8px;">📊 Impacted:</span>
-                    {stocks_badges}
-                </div>
-                '''
-
-                # Add reasons
-                reasons_html = "<ul style='margin: 8px 0 0 0; padding-left: 20px; font-size: 12px; color: #6b7280;'>"
-                for s in impacted_stocks:
-                    reasons_html += f"<li><strong>{s['ticker']}</strong>: {s.get('reason', 'Potentially impacted')}</li>"
-                reasons_html += "</ul>"
-                stocks_html += reasons_html
-
-            articles_html += f'''
-            <div style="background: white; border-radius: 16px; padding: 20px; margin-bottom: 16px; border: 1px solid #e5e7eb; box-shadow: 0 2px 4px rgba(0,0,0,0.05);">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px;">
-                    <span style="background: #f3f4f6; color: #4b5563; padding: 4px 12px; border-radius: 20px; font-size: 12px; font-weight: 500;">{source}</span>
-                    <span style="color: #9ca3af; font-size: 12px;">#{i}</span>
-                </div>
-                <h3 style="margin: 0 0 8px 0; font-size: 16px; font-weight: 600;">
-                    <a href="{url}" style="color: #1f2937; text-decoration: none;" target="_blank">{title}</a>
-                </h3>
-                <p style="margin: 0; color: #4b5563; font-size: 14px; line-height: 1.5;">{tldr}</p>
-                {stocks_html}
-                <a href="{url}" style="display: inline-block; margin-top: 12px; color: #8b5cf6; font-size: 13px; font-weight: 500; text-decoration: none;" target="_blank">
-                    Read more →
-                </a>
-            </div>
-            '''
-
-        html = f'''
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Kartik AI News - {date_str}</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background: linear-gradient(135deg, #f5f3ff 0%, #ffffff 50%, #ecfeff 100%);">
-    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-        <!-- Header -->
-        <div style="text-align: center; padding: 30px 0;">
-            <div style="display: inline-block; background: linear-gradient(135deg, #8b5cf6 0%, #06b6d4 100%); width: 60px; height: 60px; border-radius: 20px; margin-bottom: 16px; line-height: 60px; font-size: 28px;">
-                🤖
-            </div>
-            <h1 style="margin: 0; font-size: 28px; font-weight: 700; background: linear-gradient(135deg, #8b5cf6 0%, #06b6d4 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text;">
-                Kartik AI News
-            </h1>
-            <p style="margin: 8px 0 0 0; color: #6b7280; font-size: 14px;">
-                {date_str} • {len(articles)} new articles
-            </p>
-        </div>
-
-        <!-- Summary -->
-        <div style="background: linear-gradient(135deg, #8b5cf6 0%, #06b6d4 100%); border-radius: 16px; padding: 20px; margin-bottom: 24px; color: white;">
-            <h2 style="margin: 0 0 8px 0; font-size: 18px; font-weight: 600;">📰 Today's AI News Digest</h2>
-            <p style="margin: 0; font-size: 14px; opacity: 0.9;">
-                Your personalized roundup of the latest AI developments from foundational model labs and top SaaS companies, with stock impact analysis.
-            </p>
-        </div>
-
-        <!-- Articles -->
-        <div>
-            {articles_html}
-        </div>
-
-        <!-- Footer -->
-        <div style="text-align: center; padding: 30px 0; border-top: 1px solid #e5e7eb; margin-top: 20px;">
-            <p style="margin: 0 0 8px 0; color: #6b7280; font-size: 12px;">
-                Powered by Claude AI • Tracking Raimo Lenschow's Software Coverage
-            </p>
-            <p style="margin: 0; color: #9ca3af; font-size: 11px;">
-                AI News Scraper • Built with ❤️
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-'''
-        return html
-
-    def send_newsletter(self, articles: list[dict], subject: Optional[str] = None) -> dict:
-        """
-        Send newsletter email with new articles.
-
-        Args:
-            articles: List of articles with tldr and impacted_stocks
-            subject: Optional custom subject line
-
-        Returns:
-            Dict with 'success' and 'message'
-        """
+    def _check_sendable(self, articles: list[dict]) -> Optional[dict]:
+        """Return a failure result if a newsletter can't be sent, otherwise None."""
         if not self.is_available():
             return {
                 "success": False,
@@ -156,6 +113,10 @@ class Newsletter:
                 "message": "No articles to send."
             }
 
+        return None
+
+    def _render(self, articles: list[dict], subject: Optional[str]) -> tuple[str, str]:
+        """Build the subject line and HTML body for a newsletter."""
         # Generate date string
         date_str = datetime.now().strftime("%B %d, %Y")
 
@@ -163,13 +124,19 @@ class Newsletter:
         if not subject:
             subject = f"🤖 Kartik AI News - {len(articles)} New Articles ({date_str})"
 
-        # Generate HTML content
-        html_content = self._generate_html(articles, date_str)
+        return subject, self._generate_html(articles, date_str)
+
+    def _send_one(self, to_email: str, html_content: str, subject: str) -> dict:
+        """
+        Send a rendered newsletter to a single recipient.
 
+        Returns:
+            Dict with 'success' and 'message'
+        """
         try:
             message = Mail(
                 from_email=Email(self.from_email, "Kartik AI News"),
-                to_emails=To(self.to_email),
+                to_emails=To(to_email),
                 subject=subject,
                 html_content=HtmlContent(html_content)
             )
@@ -177,11 +144,10 @@ class Newsletter:
             response = self.client.send(message)
 
             if response.status_code in [200, 201, 202]:
-                logger.info(f"Newsletter sent successfully to {self.to_email}")
+                logger.info(f"Newsletter sent successfully to {to_email}")
                 return {
                     "success": True,
-                    "message": f"Newsletter sent to {self.to_email}",
-                    "articles_count": len(articles)
+                    "message": f"Newsletter sent to {to_email}"
                 }
             else:
                 logger.error(f"SendGrid error: {response.status_code}")
@@ -197,6 +163,137 @@ class Newsletter:
                 "message": f"Error: {str(e)}"
             }
 
+    def send_newsletter(self, articles: list[dict], subject: Optional[str] = None) -> dict:
+        """
+        Send newsletter email with new articles.
+
+        Args:
+            articles: List of articles with tldr and impacted_stocks
+            subject: Optional custom subject line
+
+        Returns:
+            Dict with 'success' and 'message'
+        """
+        failure = self._check_sendable(articles)
+        if failure:
+            return failure
+
+        subject, html_content = self._render(articles, subject)
+
+        result = self._send_one(self.to_email, html_content, subject)
+        if result['success']:
+            result['articles_count'] = len(articles)
+        return result
+
+    def send_newsletter_bulk(self, recipient_emails: list[str], articles: list[dict],
+                             subject: Optional[str] = None,
+                             max_workers: int = BULK_SEND_WORKERS) -> dict:
+        """
+        Send the same newsletter to many recipients, one message each.
+
+        The HTML is rendered once and messages are sent concurrently, in
+        groups with a short pause between them to stay under SendGrid's
+        rate limits.
+
+        Args:
+            recipient_emails: Addresses to send to
+            articles: List of articles with tldr and impacted_stocks
+            subject: Optional custom subject line
+            max_workers: Number of concurrent sends
+
+        Returns:
+            Dict with 'success', 'message', 'sent' and 'failed' (list of addresses)
+        """
+        failure = self._check_sendable(articles)
+        if failure:
+            return failure
+
+        subject, html_content = self._render(articles, subject)
+        failed = []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for start in range(0, len(recipient_emails), BULK_SEND_GROUP_SIZE):
+                if start > 0:
+                    time.sleep(BULK_SEND_GROUP_DELAY)
+
+                group = recipient_emails[start:start + BULK_SEND_GROUP_SIZE]
+                futures = [
+                    executor.submit(self._send_one, to_email, html_content, subject)
+                    for to_email in group
+                ]
+                failed.extend(
+                    to_email for to_email, future in zip(group, futures)
+                    if not future.result()['success']
+                )
+
+        sent = len(recipient_emails) - len(failed)
+        return {
+            "success": not failed,
+            "message": f"Newsletter sent to {sent} of {len(recipient_emails)} recipients",
+            "sent": sent,
+            "failed": failed,
+            "articles_count": len(articles)
+        }
+
+    def send_broadcast(self, recipients: list[str], articles: list[dict],
+                       subject: Optional[str] = None) -> dict:
+        """
+        Send the same newsletter to many recipients using SendGrid personalizations.
+
+        Each API call carries up to BROADCAST_BATCH_SIZE recipients, each in
+        their own personalization so they don't see each other's addresses.
+
+        Args:
+            recipients: Addresses to send to
+            articles: List of articles with tldr and impacted_stocks
+            subject: Optional custom subject line
+
+        Returns:
+            Dict with 'success', 'message', 'sent' and 'failed' (list of addresses)
+        """
+        failure = self._check_sendable(articles)
+        if failure:
+            return failure
+
+        subject, html_content = self._render(articles, subject)
+        batch_size = (BROADCAST_LARGE_BATCH_SIZE if len(html_content) > BROADCAST_LARGE_BODY
+                      else BROADCAST_BATCH_SIZE)
+        failed = []
+
+        for start in range(0, len(recipients), batch_size):
+            batch = recipients[start:start + batch_size]
+
+            try:
+                message = Mail(
+                    from_email=Email(self.from_email, "Kartik AI News"),
+                    subject=subject,
+                    html_content=HtmlContent(html_content)
+                )
+                for to_email in batch:
+                    personalization = Personalization()
+                    personalization.add_to(To(to_email))
+                    message.add_personalization(personalization)
+
+                response = self.client.send(message)
+
+                if response.status_code not in [200, 201, 202]:
+                    logger.error(f"SendGrid error: {response.status_code}")
+                    failed.extend(batch)
+
+            except Exception as e:
+                logger.error(f"Newsletter broadcast error: {e}")
+                failed.extend(batch)
+
+        sent = len(recipients) - len(failed)
+        logger.info(f"Newsletter broadcast sent to {sent} of {len(recipients)} recipients")
+        return {
+            "success": not failed,
+            "message": f"Newsletter sent to {sent} of {len(recipients)} recipients",
+            "sent": sent,
+            "failed": failed,
+            "articles_count": len(articles)
+        }
+
     def send_test_email(self) -> dict:
         """Send a test email to verify configuration."""
         test_articles = [
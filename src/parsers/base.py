@@ -1,11 +1,23 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
-import hashlib
+import xxhash
 
 
-@dataclass
+@lru_cache(maxsize=8192)
+def _url_id(url: str) -> str:
+    """Get the stable article id for a URL (16 hex characters)."""
+    return xxhash.xxh64(url.encode()).hexdigest()
+
+
+def utc_timestamp() -> str:
+    """Get the current UTC time as an ISO string ending in Z."""
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+@dataclass(slots=True, frozen=True)
 class Article:
     """Represents a scraped article."""
     id: str
@@ -19,19 +31,36 @@ class Article:
 
     @classmethod
     def create(cls, title: str, url: str, source: str, source_name: str,
-               published_date: Optional[str] = None, summary: Optional[str] = None) -> 'Article':
-        """Factory method to create an article with auto-generated id and timestamp."""
-        article_id = hashlib.sha256(url.encode()).hexdigest()[:16]
-        scraped_at = datetime.utcnow().isoformat() + "Z"
+               published_date: Optional[str] = None, summary: Optional[str] = None,
+               scraped_at: Optional[str] = None) -> 'Article':
+        """
+        Factory method to create an article with auto-generated id and timestamp.
+
+        Parsers pass one scraped_at for a whole batch; it defaults to the current time.
+        """
         return cls(
-            id=article_id,
+            id=_url_id(url),
             title=title,
             url=url,
             source=source,
             source_name=source_name,
             published_date=published_date,
             summary=summary,
-            scraped_at=scraped_at
+            scraped_at=scraped_at or utc_timestamp()
+        )
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'Article':
+        """Create an article from a stored dictionary."""
+        return cls(
+            d.get('id', ''),
+            d.get('title', ''),
+            d.get('url', ''),
+            d.get('source', ''),
+            d.get('source_name', ''),
+            d.get('published_date'),
+            d.get('summary'),
+            d.get('scraped_at', '')
         )
 
     def to_dict(self) -> dict:
@@ -51,6 +80,8 @@ class Article:
 class BaseParser(ABC):
     """Abstract base class for all parsers."""
 
+    __slots__ = ('source_config', 'source_name', 'display_name')
+
     def __init__(self, source_config: dict):
         self.source_config = source_config
         self.source_name = source_config.get('name', 'unknown')
@@ -73,7 +104,8 @@ class BaseParser(ABC):
         """Clean and normalize text content."""
         if not text:
             return None
-        return ' '.join(text.split()).strip()
+        # split() already drops leading and trailing whitespace
+        return ' '.join(text.split())
 
     def truncate_summary(self, text: Optional[str], max_length: int = 300) -> Optional[str]:
         """Truncate summary to max length with ellipsis."""
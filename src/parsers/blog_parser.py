@@ -1,42 +1,129 @@
-from bs4 import BeautifulSoup
+import logging
+import re
+from calendar import monthrange
+from datetime import datetime
 from urllib.parse import urljoin
 from typing import Optional
-from .base import BaseParser, Article
+from .base import BaseParser, Article, utc_timestamp
+from .dom import parse_html, select, select_one, get_attr, get_text
+
+logger = logging.getLogger(__name__)
+
+# Date patterns to look for in article text, in order of preference
+_DATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}\b',
+        r'\b\d{1,2}\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\b',
+        r'\b\d{4}-\d{2}-\d{2}\b',
+        r'\b\d{1,2}/\d{1,2}/\d{4}\b',
+    )
+]
+
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+_WHITESPACE_RE = re.compile(r'\s+')
+_ORDINAL_RE = re.compile(r'(\d+)(st|nd|rd|th)')
+
+# Shapes of the common date formats below, matched in one pass
+_DATE_SHAPE_RE = re.compile(
+    r'^(?:(?P<name_md>[a-z]+) (?P<day_md>\d{1,2}),? (?P<year_md>\d{4})'     # January 15, 2024
+    r'|(?P<day_dm>\d{1,2}) (?P<name_dm>[a-z]+) (?P<year_dm>\d{4})'          # 15 January 2024
+    r'|(?P<first>\d{1,2})/(?P<second>\d{1,2})/(?P<year_sl>\d{4})'           # 01/15/2024 or 15/01/2024
+    r'|(?P<year_ymd>\d{4})/(?P<month_ymd>\d{1,2})/(?P<day_ymd>\d{1,2}))$',  # 2024/01/15
+    re.IGNORECASE
+)
+
+_MONTH_NAMES = ('january', 'february', 'march', 'april', 'may', 'june', 'july',
+                'august', 'september', 'october', 'november', 'december')
+
+# Month numbers by full and abbreviated name
+_MONTHS = {
+    **{name: number for number, name in enumerate(_MONTH_NAMES, start=1)},
+    **{name[:3]: number for number, name in enumerate(_MONTH_NAMES, start=1)},
+}
+
+# Common date formats to try
+_DATE_FORMATS = (
+    '%B %d, %Y',      # January 15, 2024
+    '%b %d, %Y',      # Jan 15, 2024
+    '%B %d %Y',       # January 15 2024
+    '%b %d %Y',       # Jan 15 2024
+    '%d %B %Y',       # 15 January 2024
+    '%d %b %Y',       # 15 Jan 2024
+    '%m/%d/%Y',       # 01/15/2024
+    '%d/%m/%Y',       # 15/01/2024
+    '%Y/%m/%d',       # 2024/01/15
+)
+
+def _iso_date(year: int, month: int, day: int) -> Optional[str]:
+    """Format a calendar date as ISO, or return None if it doesn't exist."""
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= monthrange(year, month)[1]:
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}T00:00:00Z"
+
+
+def _match_date_shape(date_str: str) -> Optional[str]:
+    """Convert a date in one of the common formats to ISO without strptime."""
+    match = _DATE_SHAPE_RE.match(date_str)
+    if not match:
+        return None
+
+    groups = match.groupdict()
+    if groups['name_md']:
+        month = _MONTHS.get(groups['name_md'].lower())
+        return month and _iso_date(int(groups['year_md']), month, int(groups['day_md']))
+    if groups['name_dm']:
+        month = _MONTHS.get(groups['name_dm'].lower())
+        return month and _iso_date(int(groups['year_dm']), month, int(groups['day_dm']))
+    if groups['first']:
+        # US month-first order wins when both readings are valid
+        year, first, second = int(groups['year_sl']), int(groups['first']), int(groups['second'])
+        return _iso_date(year, first, second) or _iso_date(year, second, first)
+    return _iso_date(int(groups['year_ymd']), int(groups['month_ymd']), int(groups['day_ymd']))
+
+
+_MONTH_ABBREVIATIONS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
 
 
 class BlogParser(BaseParser):
     """Parser for HTML blog pages using CSS selectors."""
 
+    __slots__ = ('selectors', 'base_url', '_sel_article_list', '_sel_title', '_sel_link_title',
+                 '_sel_link', '_sel_date', '_sel_summary')
+
     def __init__(self, source_config: dict):
         super().__init__(source_config)
         self.selectors = source_config.get('selectors', {})
+
+        # Resolve selectors once rather than per article and field
+        self._sel_article_list = self.selectors.get('article_list', 'article')
+        self._sel_title = self.selectors.get('title', 'h1, h2, h3, [class*="title"]')
+        self._sel_link_title = self.selectors.get('title', 'h1, h2, h3')
+        self._sel_link = self.selectors.get('link', 'a')
+        self._sel_date = self.selectors.get('date', 'time, [class*="date"], [datetime]')
+        self._sel_summary = self.selectors.get('summary', 'p, [class*="description"], [class*="excerpt"]')
         self.base_url = source_config.get('url', '')
 
     def parse(self, content: str) -> list[Article]:
         """Parse HTML content and extract articles."""
-        articles = []
-        soup = BeautifulSoup(content, 'lxml')
+        soup = parse_html(content)
+        scraped_at = utc_timestamp()
 
         # Find article containers
-        article_selector = self.selectors.get('article_list', 'article')
-        article_elements = soup.select(article_selector)
+        article_elements = select(soup, self._sel_article_list)
 
         # If no articles found with primary selector, try common patterns
         if not article_elements:
             article_elements = self._find_article_containers(soup)
 
-        for element in article_elements:
-            try:
-                article = self._parse_article_element(element)
-                if article:
-                    articles.append(article)
-            except Exception as e:
-                print(f"Error parsing article element: {e}")
-                continue
-
-        return articles
+        return [
+            article
+            for article in (self._parse_article_element_safe(element, scraped_at)
+                            for element in article_elements)
+            if article
+        ]
 
-    def _find_article_containers(self, soup: BeautifulSoup) -> list:
+    def _find_article_containers(self, soup) -> list:
         """Fallback method to find article containers using common patterns."""
         patterns = [
             'article',
@@ -50,13 +137,21 @@ class BlogParser(BaseParser):
         ]
 
         for pattern in patterns:
-            elements = soup.select(pattern)
+            elements = select(soup, pattern)
             if elements:
                 return elements
 
         return []
 
-    def _parse_article_element(self, element) -> Optional[Article]:
+    def _parse_article_element_safe(self, element, scraped_at: str) -> Optional[Article]:
+        """Parse an article element, returning None instead of raising on bad markup."""
+        try:
+            return self._parse_article_element(element, scraped_at)
+        except Exception as e:
+            logger.warning("Error parsing article element: %s", e)
+            return None
+
+    def _parse_article_element(self, element, scraped_at: str) -> Optional[Article]:
         """Parse a single article element."""
         # Extract title
         title = self._extract_title(element)
@@ -83,47 +178,43 @@ class BlogParser(BaseParser):
             source=self.source_name,
             source_name=self.display_name,
             published_date=published_date,
-            summary=self.truncate_summary(summary)
+            summary=self.truncate_summary(summary),
+            scraped_at=scraped_at
         )
 
     def _extract_title(self, element) -> Optional[str]:
         """Extract title from article element."""
-        selector = self.selectors.get('title', 'h1, h2, h3, [class*="title"]')
-
         # Try configured selector
-        title_el = element.select_one(selector)
+        title_el = select_one(element, self._sel_title)
         if title_el:
-            return self.clean_text(title_el.get_text())
+            return self.clean_text(get_text(title_el))
 
         # Fallback: look for any heading
         for tag in ['h1', 'h2', 'h3', 'h4']:
-            heading = element.find(tag)
+            heading = select_one(element, tag)
             if heading:
-                return self.clean_text(heading.get_text())
+                return self.clean_text(get_text(heading))
 
         # Last resort: try the first link text
-        link = element.find('a')
-        if link and link.get_text().strip():
-            return self.clean_text(link.get_text())
+        link = select_one(element, 'a')
+        if link and get_text(link).strip():
+            return self.clean_text(get_text(link))
 
         return None
 
     def _extract_link(self, element) -> Optional[str]:
         """Extract link from article element."""
-        selector = self.selectors.get('link', 'a')
-
         # Try to find link in title first
-        title_selector = self.selectors.get('title', 'h1, h2, h3')
-        title_el = element.select_one(title_selector)
+        title_el = select_one(element, self._sel_link_title)
         if title_el:
-            link = title_el.find('a')
-            if link and link.get('href'):
-                return link.get('href')
+            link = select_one(title_el, 'a')
+            if link and get_attr(link, 'href'):
+                return get_attr(link, 'href')
 
         # Try configured selector
-        link_el = element.select_one(selector)
-        if link_el and link_el.get('href'):
-            href = link_el.get('href')
+        link_el = select_one(element, self._sel_link)
+        if link_el and get_attr(link_el, 'href'):
+            href = get_attr(link_el, 'href')
             # Skip anchor links and javascript
             if href and not href.startswith('#') and not href.startswith('javascript:'):
                 return href
@@ -132,24 +223,19 @@ class BlogParser(BaseParser):
 
     def _extract_date(self, element) -> Optional[str]:
         """Extract publication date from article element."""
-        import re
-        from datetime import datetime
-
-        selector = self.selectors.get('date', 'time, [class*="date"], [datetime]')
-
         # Try time element with datetime attribute
-        time_el = element.find('time')
-        if time_el and time_el.get('datetime'):
-            return self._normalize_date(time_el.get('datetime'))
+        time_el = select_one(element, 'time')
+        if time_el and get_attr(time_el, 'datetime'):
+            return self._normalize_date(get_attr(time_el, 'datetime'))
 
         # Try configured selector
-        date_el = element.select_one(selector)
+        date_el = select_one(element, self._sel_date)
         if date_el:
             # Check for datetime attribute
-            if date_el.get('datetime'):
-                return self._normalize_date(date_el.get('datetime'))
+            if get_attr(date_el, 'datetime'):
+                return self._normalize_date(get_attr(date_el, 'datetime'))
             # Get text content
-            date_text = self.clean_text(date_el.get_text())
+            date_text = self.clean_text(get_text(date_el))
             if date_text:
                 normalized = self._normalize_date(date_text)
                 if normalized:
@@ -157,21 +243,14 @@ class BlogParser(BaseParser):
 
         # Try finding any element with date-like attributes
         for attr in ['datetime', 'data-date', 'data-published', 'data-time']:
-            el = element.find(attrs={attr: True})
+            el = select_one(element, f'[{attr}]')
             if el:
-                return self._normalize_date(el.get(attr))
+                return self._normalize_date(get_attr(el, attr))
 
         # Look for date patterns in any text
-        date_patterns = [
-            r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}\b',
-            r'\b\d{1,2}\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\b',
-            r'\b\d{4}-\d{2}-\d{2}\b',
-            r'\b\d{1,2}/\d{1,2}/\d{4}\b',
-        ]
-
-        text = element.get_text()
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        text = get_text(element)
+        for pattern in _DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self._normalize_date(match.group())
 
@@ -182,32 +261,21 @@ class BlogParser(BaseParser):
         if not date_str:
             return None
 
-        from datetime import datetime
-        import re
-
         # Already ISO format
-        if re.match(r'^\d{4}-\d{2}-\d{2}', date_str):
+        if _ISO_DATE_RE.match(date_str):
             return date_str
 
-        # Common date formats to try
-        formats = [
-            '%B %d, %Y',      # January 15, 2024
-            '%b %d, %Y',      # Jan 15, 2024
-            '%B %d %Y',       # January 15 2024
-            '%b %d %Y',       # Jan 15 2024
-            '%d %B %Y',       # 15 January 2024
-            '%d %b %Y',       # 15 Jan 2024
-            '%m/%d/%Y',       # 01/15/2024
-            '%d/%m/%Y',       # 15/01/2024
-            '%Y/%m/%d',       # 2024/01/15
-        ]
-
         # Clean up the string
         date_str = date_str.strip()
-        date_str = re.sub(r'\s+', ' ', date_str)
-        date_str = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_str)  # Remove ordinals
+        date_str = _WHITESPACE_RE.sub(' ', date_str)
+        date_str = _ORDINAL_RE.sub(r'\1', date_str)  # Remove ordinals
+
+        iso = _match_date_shape(date_str)
+        if iso:
+            return iso
 
-        for fmt in formats:
+        # Long tail: anything the shape regex doesn't cover
+        for fmt in _DATE_FORMATS:
             try:
                 dt = datetime.strptime(date_str, fmt)
                 return dt.strftime('%Y-%m-%dT00:00:00Z')
@@ -215,25 +283,24 @@ class BlogParser(BaseParser):
                 continue
 
         # Return original if we can't parse it but it looks like a date
-        if any(month in date_str.lower() for month in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']):
+        lowered = date_str.lower()
+        if any(month in lowered for month in _MONTH_ABBREVIATIONS):
             return date_str
 
         return None
 
     def _extract_summary(self, element) -> Optional[str]:
         """Extract summary/description from article element."""
-        selector = self.selectors.get('summary', 'p, [class*="description"], [class*="excerpt"]')
-
         # Try configured selector
-        summary_el = element.select_one(selector)
+        summary_el = select_one(element, self._sel_summary)
         if summary_el:
-            text = self.clean_text(summary_el.get_text())
+            text = self.clean_text(get_text(summary_el))
             if text and len(text) > 20:  # Skip very short text
                 return text
 
         # Fallback: get first paragraph with substantial content
-        for p in element.find_all('p'):
-            text = self.clean_text(p.get_text())
+        for p in select(element, 'p'):
+            text = self.clean_text(get_text(p))
             if text and len(text) > 50:
                 return text
 
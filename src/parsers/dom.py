@@ -0,0 +1,79 @@
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# selectolax import - falls back to BeautifulSoup if not installed
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    from bs4 import BeautifulSoup
+    SELECTOLAX_AVAILABLE = False
+    logger.warning("selectolax not installed, using BeautifulSoup. Run: pip install selectolax")
+
+# Elements whose contents aren't readable text
+_NON_TEXT_TAGS = ['script', 'style']
+
+
+if SELECTOLAX_AVAILABLE:
+
+    def parse_html(content: str):
+        """Parse an HTML document."""
+        tree = LexborHTMLParser(content)
+        tree.strip_tags(_NON_TEXT_TAGS)
+        return tree
+
+    def select(root, selector: str) -> list:
+        """Get all descendants of a document or element matching a CSS selector."""
+        matches = root.css(selector)
+        # Element queries also match the element itself, which BeautifulSoup never does
+        if matches and matches[0].mem_id == getattr(root, 'mem_id', None):
+            return matches[1:]
+        return matches
+
+    def select_one(element, selector: str):
+        """Get the first descendant of an element matching a CSS selector, or None."""
+        match = element.css_first(selector)
+        if match is not None and match.mem_id == element.mem_id:
+            matches = element.css(selector)
+            return matches[1] if len(matches) > 1 else None
+        return match
+
+    def get_attr(element, name: str) -> Optional[str]:
+        """Get an attribute value from an element."""
+        return element.attributes.get(name)
+
+    def get_text(element) -> str:
+        """Get all text inside an element."""
+        return element.text()
+
+    def html_to_text(html: str) -> str:
+        """Convert an HTML fragment to plain text, with a space between text nodes."""
+        return parse_html(html).text(separator=' ', strip=True, skip_empty=True)
+
+else:
+
+    def parse_html(content: str):
+        """Parse an HTML document."""
+        return BeautifulSoup(content, 'lxml')
+
+    def select(root, selector: str) -> list:
+        """Get all descendants of a document or element matching a CSS selector."""
+        return root.select(selector)
+
+    def select_one(element, selector: str):
+        """Get the first descendant of an element matching a CSS selector, or None."""
+        return element.select_one(selector)
+
+    def get_attr(element, name: str) -> Optional[str]:
+        """Get an attribute value from an element."""
+        return element.get(name)
+
+    def get_text(element) -> str:
+        """Get all text inside an element."""
+        return element.get_text()
+
+    def html_to_text(html: str) -> str:
+        """Convert an HTML fragment to plain text, with a space between text nodes."""
+        return BeautifulSoup(html, 'lxml').get_text(separator=' ', strip=True)
@@ -1,29 +1,46 @@
+import html
+import logging
+import re
 import feedparser
-from datetime import datetime
 from typing import Optional
-from .base import BaseParser, Article
+from .base import BaseParser, Article, utc_timestamp
+from .dom import html_to_text
+
+logger = logging.getLogger(__name__)
+
+# Feed summaries are almost always flat markup, so tags can be stripped with regexes
+_NON_TEXT_RE = re.compile(r'<(script|style)\b.*?</\1\s*>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Entry fields holding the summary text, in order of preference
+_SUMMARY_FIELDS = ('summary', 'description')
 
 
 class RSSParser(BaseParser):
     """Parser for RSS and Atom feeds."""
 
+    __slots__ = ()
+
     def parse(self, content: str) -> list[Article]:
         """Parse RSS/Atom feed content and extract articles."""
-        articles = []
         feed = feedparser.parse(content)
+        scraped_at = utc_timestamp()
+
+        return [
+            article
+            for article in (self._parse_entry_safe(entry, scraped_at) for entry in feed.entries)
+            if article
+        ]
+
+    def _parse_entry_safe(self, entry, scraped_at: str) -> Optional[Article]:
+        """Parse a feed entry, returning None instead of raising on bad entries."""
+        try:
+            return self._parse_entry(entry, scraped_at)
+        except Exception as e:
+            logger.warning("Error parsing RSS entry: %s", e)
+            return None
 
-        for entry in feed.entries:
-            try:
-                article = self._parse_entry(entry)
-                if article:
-                    articles.append(article)
-            except Exception as e:
-                print(f"Error parsing RSS entry: {e}")
-                continue
-
-        return articles
-
-    def _parse_entry(self, entry) -> Optional[Article]:
+    def _parse_entry(self, entry, scraped_at: str) -> Optional[Article]:
         """Parse a single RSS feed entry."""
         title = self.clean_text(getattr(entry, 'title', None))
         link = getattr(entry, 'link', None)
@@ -43,7 +60,8 @@ class RSSParser(BaseParser):
             source=self.source_name,
             source_name=self.display_name,
             published_date=published_date,
-            summary=self.truncate_summary(summary)
+            summary=self.truncate_summary(summary),
+            scraped_at=scraped_at
         )
 
     def _extract_date(self, entry) -> Optional[str]:
@@ -53,11 +71,8 @@ class RSSParser(BaseParser):
         for field in date_fields:
             date_tuple = getattr(entry, field, None)
             if date_tuple:
-                try:
-                    dt = datetime(*date_tuple[:6])
-                    return dt.isoformat() + "Z"
-                except Exception:
-                    continue
+                # feedparser's parsed dates are already-validated UTC struct_times
+                return "%04d-%02d-%02dT%02d:%02d:%02dZ" % tuple(date_tuple[:6])
 
         # Try string date fields
         string_fields = ['published', 'updated', 'created']
@@ -70,26 +85,28 @@ class RSSParser(BaseParser):
 
     def _extract_summary(self, entry) -> Optional[str]:
         """Extract summary/description from RSS entry."""
-        # Try summary first
-        summary = getattr(entry, 'summary', None)
-        if summary:
-            # Strip HTML tags for cleaner text
-            return self._strip_html(summary)
-
-        # Try description
-        description = getattr(entry, 'description', None)
-        if description:
-            return self._strip_html(description)
-
-        # Try content
-        content = getattr(entry, 'content', None)
-        if content and len(content) > 0:
+        # Summary first, then description; plain dict access skips feedparser's attribute fallback
+        for field in _SUMMARY_FIELDS:
+            value = entry.get(field)
+            if value:
+                # Strip HTML tags for cleaner text
+                return self._strip_html(value)
+
+        # Try content, a list of dicts
+        content = entry.get('content')
+        if content:
             return self._strip_html(content[0].get('value', ''))
 
         return None
 
-    def _strip_html(self, html: str) -> str:
+    def _strip_html(self, markup: str) -> str:
         """Remove HTML tags from text."""
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'lxml')
-        return soup.get_text(separator=' ', strip=True)
+        if '<' not in markup:
+            return ' '.join(html.unescape(markup).split())
+
+        # Unbalanced brackets mean broken markup; let the real HTML parser handle it
+        if markup.count('<') != markup.count('>'):
+            return html_to_text(markup)
+
+        text = _TAG_RE.sub(' ', _NON_TEXT_RE.sub(' ', markup))
+        return ' '.join(html.unescape(text).split())
@@ -1,8 +1,8 @@
-import schedule
-import time
+import asyncio
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Optional
 
 from .scraper import Scraper
 from .storage import Storage
@@ -13,129 +13,167 @@ from .newsletter import Newsletter
 logger = logging.getLogger(__name__)
 
 
-def run_scrape_job(send_newsletter: bool = True):
-    """Execute a full scrape of all sources with stock tagging and newsletter."""
-    logger.info(f"Starting scheduled scrape at {datetime.now().isoformat()}")
-
-    try:
-        scraper = Scraper()
-        storage = Storage()
-        deduplicator = Deduplicator(storage)
-        stock_tagger = StockTagger()
-        newsletter = Newsletter()
-
-        # Scrape all sources
-        results = scraper.scrape_all()
-
-        # Track new articles for newsletter
-        all_new_articles = []
-
-        for source_name, articles in results.items():
-            if articles:
-                # Get count of truly new articles before merging
-                new_count = len(articles) - deduplicator.get_duplicate_count(source_name, articles)
-
-                # Filter to only new articles (for tagging)
-                existing_urls = {a.get('url') for a in storage.load_articles(source_name)}
-                new_articles = [a for a in articles if a.url not in existing_urls]
-
-                # Tag new articles with stock impacts
-                if new_articles and stock_tagger.is_available():
-                    logger.info(f"Tagging {len(new_articles)} new articles from {source_name}")
-                    for i, article in enumerate(new_articles):
-                        # Add delay between API calls to avoid rate limiting
-                        if i > 0:
-                            time.sleep(2)
-
-                        tag_result = stock_tagger.tag_article(article.to_dict())
-                        # Store tagged data
-                        tagged_dict = article.to_dict()
-                        tagged_dict['tldr'] = tag_result['tldr']
-                        tagged_dict['impacted_stocks'] = tag_result['impacted_stocks']
-                        all_new_articles.append(tagged_dict)
-
-                # Merge with existing, filtering duplicates
-                merged = deduplicator.merge_articles(source_name, articles)
-                # Save merged articles
-                storage.save_articles(source_name, merged)
-
-                if new_count > 0:
-                    logger.info(f"Added {new_count} new articles from {source_name}")
-
-        # Clean up articles older than 14 days
-        removed = storage.cleanup_old_articles(days=14)
-
-        # Update combined file
-        total = storage.update_combined_file()
-
-        logger.info(f"Scrape complete. {len(all_new_articles)} new articles, {removed} old articles removed.")
-
-        # Send newsletter if there are new articles
-        if send_newsletter and all_new_articles and newsletter.is_available():
-            logger.info(f"Sending newsletter with {len(all_new_articles)} new articles...")
-            result = newsletter.send_newsletter(all_new_articles)
-            if result['success']:
-                logger.info(f"Newsletter sent successfully!")
-            else:
-                logger.warning(f"Newsletter failed: {result['message']}")
-        elif all_new_articles and not newsletter.is_available():
-            logger.warning("Newsletter not available - check SENDGRID_API_KEY")
+class ScrapeJob:
+    """Scrape, dedup, tagging and newsletter services, built once and reused across runs."""
 
-        return {
-            "total_articles": total,
-            "new_articles": len(all_new_articles),
-            "newsletter_sent": send_newsletter and newsletter.is_available() and len(all_new_articles) > 0
-        }
+    def __init__(self):
+        self.scraper = Scraper()
+        self.storage = Storage()
+        self.deduplicator = Deduplicator(self.storage)
+        self.stock_tagger = StockTagger()
+        self.newsletter = Newsletter()
+
+    async def run(self, send_newsletter: bool = True) -> dict:
+        """
+        Execute a full scrape of all sources with stock tagging and newsletter.
+
+        Network calls are awaited and blocking storage work runs in worker
+        threads, so the job can share an event loop with the web server.
+        """
+        logger.info(f"Starting scheduled scrape at {datetime.now().isoformat()}")
+
+        try:
+            # Scrape all sources
+            results = await self.scraper.scrape_all_async()
+
+            def add_new_articles() -> list[dict]:
+                """Dedup and store each source's new articles, returning them across all sources."""
+                new_article_dicts = []
+
+                for source_name, articles in results.items():
+                    if articles:
+                        # Dedup against the source's persisted URL filter
+                        new_articles = self.deduplicator.filter_new_articles(source_name, articles)
+
+                        if new_articles:
+                            # Convert once; the same dicts are stored and then tagged.
+                            # Only the new articles are appended; stored ones aren't rewritten
+                            article_dicts = [a.to_dict() for a in new_articles]
+                            self.storage.add_article_dicts(source_name, article_dicts)
+                            self.deduplicator.record_stored(source_name, new_articles)
+                            new_article_dicts.extend(article_dicts)
+                            logger.info(f"Added {len(new_articles)} new articles from {source_name}")
+
+                # Everything scraped is stored, so unchanged pages can be skipped next run
+                self.scraper.commit_validators()
+                return new_article_dicts
+
+            # New articles from every source, tagged together below
+            new_article_dicts = await asyncio.to_thread(add_new_articles)
+
+            # Track new articles for newsletter
+            all_new_articles = []
+
+            # Tag new articles with stock impacts, with the grouped requests in flight at once
+            if new_article_dicts and self.stock_tagger.is_available():
+                logger.info(f"Tagging {len(new_article_dicts)} new articles")
+                tag_results = await self.stock_tagger.tag_articles_grouped_async(new_article_dicts)
+
+                for tagged_dict, tag_result in zip(new_article_dicts, tag_results):
+                    # Store tagged data
+                    tagged_dict['tldr'] = tag_result['tldr']
+                    tagged_dict['impacted_stocks'] = tag_result['impacted_stocks']
+                    all_new_articles.append(tagged_dict)
+
+            # Clean up articles older than 14 days
+            removed = await asyncio.to_thread(self.storage.cleanup_old_articles, days=14)
+
+            total = await asyncio.to_thread(self.storage.count_articles)
+
+            logger.info(f"Scrape complete. {len(all_new_articles)} new articles, {removed} old articles removed.")
+
+            # Send newsletter if there are new articles
+            if send_newsletter and all_new_articles and self.newsletter.is_available():
+                logger.info(f"Sending newsletter with {len(all_new_articles)} new articles...")
+                result = await asyncio.to_thread(self.newsletter.send_newsletter, all_new_articles)
+                if result['success']:
+                    logger.info(f"Newsletter sent successfully!")
+                else:
+                    logger.warning(f"Newsletter failed: {result['message']}")
+            elif all_new_articles and not self.newsletter.is_available():
+                logger.warning("Newsletter not available - check SENDGRID_API_KEY")
 
-    except Exception as e:
-        logger.error(f"Scrape job failed: {e}")
-        return {"error": str(e)}
+            return {
+                "total_articles": total,
+                "new_articles": len(all_new_articles),
+                "newsletter_sent": send_newsletter and self.newsletter.is_available() and len(all_new_articles) > 0
+            }
+
+        except Exception as e:
+            logger.error(f"Scrape job failed: {e}")
+            return {"error": str(e)}
+
+        finally:
+            # Fold this run's additions into fresh snapshots next time
+            self.deduplicator.clear_cache()
+
+            # The client's connections are tied to this run's event loop
+            await self.stock_tagger.aclose()
+
+
+async def run_scrape_job_async(send_newsletter: bool = True):
+    """Execute a full scrape job with freshly built services."""
+    return await ScrapeJob().run(send_newsletter=send_newsletter)
+
+
+def run_scrape_job(send_newsletter: bool = True):
+    """Execute a full scrape job from synchronous code."""
+    return asyncio.run(run_scrape_job_async(send_newsletter=send_newsletter))
 
 
 class NewsScheduler:
-    """Scheduler for automatic news scraping."""
+    """Scheduler for automatic news scraping, driven by an asyncio task."""
 
     def __init__(self, interval_hours: int = None):
         self.interval_hours = interval_hours or int(os.getenv('SCRAPE_INTERVAL_HOURS', 1))
         self.running = False
-
-    def setup(self):
-        """Set up the scheduled job."""
-        schedule.clear()
-        schedule.every(self.interval_hours).hours.do(run_scrape_job)
-        logger.info(f"Scheduled scraping every {self.interval_hours} hours")
+        self.job = ScrapeJob()
+        self._next_run: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
 
     def run_once(self, send_newsletter: bool = True):
         """Run the scrape job once immediately."""
-        return run_scrape_job(send_newsletter=send_newsletter)
+        return asyncio.run(self.job.run(send_newsletter=send_newsletter))
 
-    def start(self):
-        """Start the scheduler loop."""
-        self.setup()
+    async def run_forever(self):
+        """Run the scrape job now and then every interval until stopped."""
+        logger.info(f"Scheduled scraping every {self.interval_hours} hours")
+        self.running = True
 
-        # Run immediately on start
-        logger.info("Running initial scrape...")
-        run_scrape_job()
+        try:
+            while self.running:
+                await self.job.run()
 
-        logger.info("Starting scheduler loop...")
-        self.running = True
+                interval = timedelta(hours=self.interval_hours)
+                self._next_run = datetime.now() + interval
+                await asyncio.sleep(interval.total_seconds())
+        finally:
+            self.running = False
+            self._next_run = None
+
+    def start(self):
+        """Run the scheduler on its own event loop, blocking until stopped."""
+        logger.info("Running initial scrape...")
+        asyncio.run(self.run_forever())
 
-        while self.running:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+    def start_background(self) -> asyncio.Task:
+        """Run the scheduler as a task on the current event loop."""
+        self._task = asyncio.create_task(self.run_forever())
+        return self._task
 
     def stop(self):
-        """Stop the scheduler loop."""
+        """Stop the scheduler."""
         self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
         logger.info("Scheduler stopped")
 
     def get_next_run(self) -> str:
         """Get the time of the next scheduled run."""
-        jobs = schedule.get_jobs()
-        if jobs:
-            next_run = jobs[0].next_run
-            return next_run.isoformat() if next_run else "Not scheduled"
-        return "No jobs scheduled"
+        if self._next_run:
+            return self._next_run.isoformat()
+        return "Not scheduled"
 
     def get_status(self) -> dict:
         """Get scheduler status information."""
@@ -143,5 +181,5 @@ class NewsScheduler:
             "running": self.running,
             "interval_hours": self.interval_hours,
             "next_run": self.get_next_run(),
-            "job_count": len(schedule.get_jobs())
+            "job_count": 1 if self.running else 0
         }
@@ -1,13 +1,16 @@
+import asyncio
+import aiohttp
 import requests
 import requests_cache
-import time
 import logging
 from pathlib import Path
 from typing import Optional
-import yaml
+from urllib.parse import urlsplit
+import orjson
 
 from .parsers import RSSParser, BlogParser
 from .parsers.base import Article
+from .yaml_config import load_yaml
 
 # Set up logging
 logging.basicConfig(
@@ -16,6 +19,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Connection caps for concurrent scraping
+MAX_CONNECTIONS = 20
+MAX_CONNECTIONS_PER_HOST = 2
+
+# ETag / Last-Modified values from earlier fetches, for conditional requests
+VALIDATORS_PATH = Path("data/.http_validators.json")
+
+
+class HostThrottle:
+    """Spaces out requests to the same host without delaying other hosts."""
+
+    def __init__(self):
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last_request: dict[str, float] = {}
+
+    async def wait(self, url: str, interval: float):
+        """Wait until at least `interval` seconds have passed since the last request to this host."""
+        host = urlsplit(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+
+        async with lock:
+            loop = asyncio.get_running_loop()
+            last = self._last_request.get(host)
+            if last is not None:
+                delay = last + interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self._last_request[host] = loop.time()
+
 
 class Scraper:
     """Core web scraper for fetching and parsing news sources."""
@@ -36,12 +68,20 @@ class Scraper:
         else:
             self.session = requests.Session()
 
+        # Cache validators so unchanged pages come back as empty 304 responses
+        self._validators: Optional[dict[str, dict]] = self._load_validators() if use_cache else None
+
+        # Validators from this run's fetches, kept out of the cache until the
+        # articles they cover are stored (None marks a URL to forget)
+        self._pending_validators: dict[str, Optional[dict]] = {}
+
         # Set default headers
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': self.defaults.get('user_agent', 'AI-News-Scraper/1.0'),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-        })
+        }
+        self.session.headers.update(self.headers)
 
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
@@ -50,8 +90,66 @@ class Scraper:
             logger.warning(f"Config file not found: {config_path}")
             return {'sources': [], 'defaults': {}}
 
-        with open(config_file, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return load_yaml(config_file)
+
+    def _load_validators(self) -> dict[str, dict]:
+        """Load saved ETag / Last-Modified values, keyed by URL."""
+        if not VALIDATORS_PATH.exists():
+            return {}
+
+        try:
+            with open(VALIDATORS_PATH, 'rb') as f:
+                return orjson.loads(f.read())
+        except (orjson.JSONDecodeError, IOError) as e:
+            logger.warning(f"Error loading {VALIDATORS_PATH}: {e}")
+            return {}
+
+    def commit_validators(self):
+        """
+        Adopt and persist the validators from the latest scrape.
+
+        Call this only once the scraped articles are stored; until then the
+        next run still fetches every page in full, so nothing is lost if
+        storing fails.
+        """
+        if self._validators is None or not self._pending_validators:
+            return
+
+        for url, validators in self._pending_validators.items():
+            if validators:
+                self._validators[url] = validators
+            else:
+                self._validators.pop(url, None)
+        self._pending_validators.clear()
+
+        self._save_validators()
+
+    def _save_validators(self):
+        """Persist ETag / Last-Modified values for the next run."""
+        if self._validators is None:
+            return
+
+        try:
+            VALIDATORS_PATH.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = VALIDATORS_PATH.with_suffix('.tmp')
+            with open(temp_path, 'wb') as f:
+                f.write(orjson.dumps(self._validators))
+            temp_path.replace(VALIDATORS_PATH)
+        except IOError as e:
+            logger.warning(f"Error saving {VALIDATORS_PATH}: {e}")
+
+    def _conditional_headers(self, url: str) -> dict:
+        """Get If-None-Match / If-Modified-Since headers for a previously fetched URL."""
+        validators = self._validators.get(url) if self._validators else None
+        if not validators:
+            return {}
+
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
 
     def fetch(self, url: str, timeout: Optional[int] = None) -> Optional[str]:
         """
@@ -74,6 +172,46 @@ class Scraper:
             logger.error(f"Failed to fetch {url}: {e}")
             return None
 
+    async def fetch_async(self, session: aiohttp.ClientSession, url: str,
+                          timeout: Optional[int] = None) -> Optional[str]:
+        """
+        Fetch content from a URL using a shared aiohttp session.
+
+        Sends the validators from the previous fetch, so an unchanged page
+        costs a bodiless 304 response.
+
+        Args:
+            session: Client session to issue the request on
+            url: URL to fetch
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response content as string, an empty string if unchanged since
+            the last fetch, or None if failed
+        """
+        timeout = timeout or self.defaults.get('request_timeout', 30)
+
+        try:
+            async with session.get(url, headers=self._conditional_headers(url),
+                                   timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status == 304:
+                    return ''
+                response.raise_for_status()
+                content = await response.text()
+
+                if self._validators is not None:
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                    if etag or last_modified:
+                        self._pending_validators[url] = {'etag': etag, 'last_modified': last_modified}
+                    else:
+                        self._pending_validators[url] = None
+
+                return content
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+            return None
+
     def scrape_source(self, source: dict) -> list[Article]:
         """
         Scrape a single source.
@@ -86,7 +224,6 @@ class Scraper:
         """
         name = source.get('name', 'unknown')
         url = source.get('url')
-        source_type = source.get('type', 'html')
 
         logger.info(f"Scraping {name} from {url}")
 
@@ -96,6 +233,51 @@ class Scraper:
             logger.warning(f"No content received from {name}")
             return []
 
+        return self._parse_content(source, content)
+
+    async def scrape_source_async(self, session: aiohttp.ClientSession, source: dict,
+                                  throttle: HostThrottle) -> list[Article]:
+        """
+        Scrape a single source without blocking other sources.
+
+        Args:
+            session: Client session shared across sources
+            source: Source configuration dictionary
+            throttle: Rate limits requests per host
+
+        Returns:
+            List of scraped articles
+        """
+        name = source.get('name', 'unknown')
+        url = source.get('url')
+        rate_limit = source.get('rate_limit_seconds', 1)
+
+        # Only sources sharing a host wait on each other
+        await throttle.wait(url, rate_limit)
+
+        logger.info(f"Scraping {name} from {url}")
+        content = await self.fetch_async(session, url)
+
+        if content == '':
+            logger.info(f"No changes from {name} since last fetch")
+            return []
+        if not content:
+            logger.warning(f"No content received from {name}")
+            return []
+
+        try:
+            # Parsing is CPU-bound, so run it in a worker thread to keep the loop responsive
+            return await asyncio.to_thread(self._parse_content, source, content)
+        except Exception:
+            # Keep sending the old validators so the page is fetched again
+            self._pending_validators.pop(url, None)
+            raise
+
+    def _parse_content(self, source: dict, content: str) -> list[Article]:
+        """Parse fetched content with the parser for the source's type."""
+        name = source.get('name', 'unknown')
+        source_type = source.get('type', 'html')
+
         # Select appropriate parser
         if source_type == 'rss':
             parser = RSSParser(source)
@@ -110,31 +292,50 @@ class Scraper:
         max_articles = self.defaults.get('max_articles_per_source', 50)
         return articles[:max_articles]
 
-    def scrape_all(self) -> dict[str, list[Article]]:
+    async def scrape_all_async(self) -> dict[str, list[Article]]:
         """
-        Scrape all configured sources.
+        Scrape all configured sources concurrently.
+
+        New ETag / Last-Modified values are held back; call commit_validators()
+        once the results are stored.
 
         Returns:
             Dictionary mapping source names to lists of articles
         """
         results = {}
+        throttle = HostThrottle()
+
+        # Drop validators from an earlier scrape whose results were never stored
+        self._pending_validators.clear()
+        connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS,
+                                         limit_per_host=MAX_CONNECTIONS_PER_HOST,
+                                         keepalive_timeout=30)
+
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
+            scraped = await asyncio.gather(
+                *[self.scrape_source_async(session, source, throttle) for source in self.sources],
+                return_exceptions=True
+            )
 
-        for source in self.sources:
+        for source, articles in zip(self.sources, scraped):
             name = source.get('name', 'unknown')
-            rate_limit = source.get('rate_limit_seconds', 1)
-
-            try:
-                articles = self.scrape_source(source)
-                results[name] = articles
-            except Exception as e:
-                logger.error(f"Error scraping {name}: {e}")
+            if isinstance(articles, Exception):
+                logger.error(f"Error scraping {name}: {articles}")
                 results[name] = []
-
-            # Respect rate limit
-            time.sleep(rate_limit)
+            else:
+                results[name] = articles
 
         return results
 
+    def scrape_all(self) -> dict[str, list[Article]]:
+        """
+        Scrape all configured sources.
+
+        Returns:
+            Dictionary mapping source names to lists of articles
+        """
+        return asyncio.run(self.scrape_all_async())
+
     def scrape_by_name(self, source_name: str) -> list[Article]:
         """
         Scrape a specific source by name.
@@ -1,31 +1,111 @@
-import os
+import asyncio
 import logging
-import yaml
+import re
 import time
 from pathlib import Path
-from anthropic import Anthropic
+import orjson
+from anthropic import AsyncAnthropic
+
+from .llm_client import get_client
+from .yaml_config import load_yaml
 
 logger = logging.getLogger(__name__)
 
 # Delay between API calls to avoid rate limiting (seconds)
 API_CALL_DELAY = 2
 
+# Seconds between status checks on submitted message batches
+BATCH_POLL_INTERVAL = 30
+
+# Requests submitted per message batch
+BATCH_SIZE = 100
+
+# Seconds to wait for message batches before cancelling them
+BATCH_TIMEOUT = 60 * 60
+
+# Concurrent requests allowed on the non-batch async path
+MAX_CONCURRENT_REQUESTS = 10
+
+# Articles tagged per request by tag_articles_grouped
+GROUP_SIZE = 15
+
+# Response tokens budgeted per article in a grouped request
+GROUP_TOKENS_PER_ARTICLE = 400
+
+# Outermost JSON object or array in a response, which may wrap it in prose
+_JSON_OBJECT_RE = re.compile(r'\{[\s\S]*\}')
+_JSON_ARRAY_RE = re.compile(r'\[[\s\S]*\]')
+
+# Prompt text shared by the single-article and grouped tagging prompts
+_PROMPT_TASK = (
+    "determine which software stocks from Raimo Lenschow's Barclays coverage list "
+    "would be impacted."
+)
+
+_ARTICLE_FIELDS = """Title: {title}
+Source: {source}
+Summary: {summary}
+URL: {url}"""
+
+_PROMPT_INSTRUCTIONS = """1. A TLDR summary (1-2 sentences, like TLDR AI newsletter style - concise, informative, slightly witty)
+2. List of impacted stock tickers (only from the list above, can be empty if none directly impacted)
+3. Brief explanation of why each stock is impacted (1 sentence each)"""
+
+_PROMPT_RULES = """If no stocks are clearly impacted, return an empty array for impacted_stocks.
+Only include stocks that have a clear, direct connection to the news - don't stretch to include tangentially related stocks."""
+
+
+def _article_fields(article: dict) -> str:
+    """Format an article's fields for a tagging prompt."""
+    return _ARTICLE_FIELDS.format(
+        title=article.get('title', 'Untitled'),
+        source=article.get('source_name', 'Unknown'),
+        summary=article.get('summary', 'No summary'),
+        url=article.get('url', '')
+    )
+
 
 class StockTagger:
     """Uses Claude to analyze articles and tag impacted stocks from Raimo's coverage."""
 
     def __init__(self, stocks_config_path: str = "config/stocks.yaml"):
         self.stocks = self._load_stocks(stocks_config_path)
+        # The stock list doesn't change at runtime, so the prompt's static part is built once
+        self._stocks_context = self._build_stocks_context()
+        self._prompt_prefix = (
+            f"Analyze this AI news article and {_PROMPT_TASK}\n\n"
+            f"{self._stocks_context}\n\nARTICLE:\n"
+        )
+        self._group_prompt_prefix = (
+            f"Analyze each of these AI news articles and {_PROMPT_TASK}\n\n"
+            f"{self._stocks_context}\n\nARTICLES:\n"
+        )
         self.client = None
+        self.async_client = None
         self._init_client()
 
     def _init_client(self):
-        """Initialize Anthropic client."""
-        api_key = os.getenv('ANTHROPIC_API_KEY')
-        if not api_key:
-            logger.warning("ANTHROPIC_API_KEY not set. Stock tagging will be disabled.")
-            return
-        self.client = Anthropic(api_key=api_key)
+        """Initialize the Anthropic client, reusing the process-wide sync client."""
+        self.client = get_client()
+        if self.client is None:
+            logger.warning("Stock tagging will be disabled.")
+
+    def _get_async_client(self) -> AsyncAnthropic:
+        """
+        Get the async client, creating it on the running event loop if needed.
+
+        Its pooled connections belong to the loop that first uses them, so
+        callers that run on a new loop should aclose() it when done.
+        """
+        if self.async_client is None:
+            self.async_client = AsyncAnthropic(api_key=self.client.api_key)
+        return self.async_client
+
+    async def aclose(self):
+        """Close the async client; the next async call creates a fresh one."""
+        if self.async_client is not None:
+            client, self.async_client = self.async_client, None
+            await client.close()
 
     def _load_stocks(self, config_path: str) -> list[dict]:
         """Load stocks from YAML config."""
@@ -34,9 +114,7 @@ class StockTagger:
             logger.warning(f"Stocks config not found: {config_path}")
             return []
 
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            return config.get('stocks', [])
+        return load_yaml(config_file).get('stocks', [])
 
     def is_available(self) -> bool:
         """Check if stock tagging is available."""
@@ -50,6 +128,73 @@ class StockTagger:
             lines.append(f"- {stock['ticker']} ({stock['name']}): {stock['sector']} - Keywords: {keywords}")
         return "\n".join(lines)
 
+    def _build_prompt(self, article: dict) -> str:
+        """Build the tagging prompt for an article."""
+        return self._prompt_prefix + f"""{_article_fields(article)}
+
+Please provide:
+{_PROMPT_INSTRUCTIONS}
+
+Respond in this exact JSON format:
+{{
+    "tldr": "Your 1-2 sentence TLDR summary here",
+    "impacted_stocks": [
+        {{"ticker": "MSFT", "reason": "Microsoft's Copilot competes directly with this new AI feature"}},
+        {{"ticker": "CRM", "reason": "Salesforce could integrate similar AI capabilities"}}
+    ]
+}}
+
+{_PROMPT_RULES}"""
+
+    def _fallback_tldr(self, article: dict) -> str:
+        """TLDR to use when the article couldn't be tagged."""
+        summary = article.get('summary', 'No summary')
+        return summary[:200] if summary else article.get('title', 'Untitled')[:200]
+
+    def _parse_response(self, article: dict, response_text: str) -> dict:
+        """Parse Claude's JSON response into a tagging result."""
+        # Find JSON in response
+        json_match = _JSON_OBJECT_RE.search(response_text)
+        if json_match:
+            result = orjson.loads(json_match.group())
+            return {
+                "tldr": result.get('tldr', self._fallback_tldr(article)),
+                "impacted_stocks": result.get('impacted_stocks', []),
+                "analysis": "Success"
+            }
+        else:
+            return {
+                "tldr": self._fallback_tldr(article),
+                "impacted_stocks": [],
+                "analysis": "Could not parse response"
+            }
+
+    def _error_result(self, article: dict, error) -> dict:
+        """Result returned when tagging an article failed."""
+        return {
+            "tldr": self._fallback_tldr(article),
+            "impacted_stocks": [],
+            "analysis": f"Error: {str(error)}"
+        }
+
+    def _request_params(self, article: dict) -> dict:
+        """Build the Messages API parameters for tagging an article."""
+        return {
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 1024,
+            "messages": [
+                {"role": "user", "content": self._build_prompt(article)}
+            ]
+        }
+
+    def _unavailable_result(self, article: dict) -> dict:
+        """Result returned when stock tagging isn't configured."""
+        return {
+            "impacted_stocks": [],
+            "tldr": (article.get('summary') or '')[:200],
+            "analysis": "Stock tagging unavailable"
+        }
+
     def tag_article(self, article: dict) -> dict:
         """
         Analyze an article and tag which stocks it impacts.
@@ -61,85 +206,274 @@ class StockTagger:
             Dict with 'impacted_stocks', 'tldr', and 'analysis'
         """
         if not self.is_available():
-            return {
-                "impacted_stocks": [],
-                "tldr": article.get('summary', '')[:200],
-                "analysis": "Stock tagging unavailable"
-            }
+            return self._unavailable_result(article)
 
-        title = article.get('title', 'Untitled')
-        summary = article.get('summary', 'No summary')
-        source = article.get('source_name', 'Unknown')
-        url = article.get('url', '')
+        try:
+            response = self.client.messages.create(**self._request_params(article))
 
-        stocks_context = self._build_stocks_context()
+            return self._parse_response(article, response.content[0].text)
 
-        prompt = f"""Analyze this AI news article and determine which software stocks from Raimo Lenschow's Barclays coverage list would be impacted.
+        except Exception as e:
+            logger.error(f"Stock tagging error: {e}")
+            return self._error_result(article, e)
 
-{stocks_context}
+    async def tag_article_async(self, article: dict) -> dict:
+        """
+        Analyze an article without blocking, so many articles can be tagged concurrently.
 
-ARTICLE:
-Title: {title}
-Source: {source}
-Summary: {summary}
-URL: {url}
+        Args:
+            article: Article dict with title, summary, source, url
 
-Please provide:
-1. A TLDR summary (1-2 sentences, like TLDR AI newsletter style - concise, informative, slightly witty)
-2. List of impacted stock tickers (only from the list above, can be empty if none directly impacted)
-3. Brief explanation of why each stock is impacted (1 sentence each)
+        Returns:
+            Dict with 'impacted_stocks', 'tldr', and 'analysis'
+        """
+        if not self.is_available():
+            return self._unavailable_result(article)
 
-Respond in this exact JSON format:
-{{
-    "tldr": "Your 1-2 sentence TLDR summary here",
-    "impacted_stocks": [
-        {{"ticker": "MSFT", "reason": "Microsoft's Copilot competes directly with this new AI feature"}},
-        {{"ticker": "CRM", "reason": "Salesforce could integrate similar AI capabilities"}}
-    ]
-}}
+        try:
+            response = await self._get_async_client().messages.create(**self._request_params(article))
 
-If no stocks are clearly impacted, return an empty array for impacted_stocks.
-Only include stocks that have a clear, direct connection to the news - don't stretch to include tangentially related stocks."""
+            return self._parse_response(article, response.content[0].text)
+
+        except Exception as e:
+            logger.error(f"Stock tagging error: {e}")
+            return self._error_result(article, e)
+
+    async def tag_articles_async(self, articles: list[dict],
+                                 concurrency: int = MAX_CONCURRENT_REQUESTS) -> list[dict]:
+        """
+        Tag articles with concurrent API calls, bounded by a semaphore.
+
+        Args:
+            articles: List of article dicts
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            Tagging results in the same order as articles
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def tag_one(article):
+            async with semaphore:
+                return await self.tag_article_async(article)
+
+        return await asyncio.gather(*[tag_one(article) for article in articles])
+
+    def tag_articles_batch(self, articles: list[dict], batch_size: int = BATCH_SIZE,
+                           timeout: float = BATCH_TIMEOUT) -> list[dict]:
+        """
+        Tag articles with Message Batches API jobs.
+
+        Batched requests cost half as much as individual calls but can take
+        minutes to complete, so use tag_articles_async when latency matters.
+        Every batch is submitted up front and the batches are polled together,
+        so the wait is that of the slowest batch rather than the sum of all.
+
+        Args:
+            articles: List of article dicts
+            batch_size: Maximum requests per batch
+            timeout: Seconds to wait before cancelling unfinished batches
+
+        Returns:
+            Tagging results in the same order as articles
+        """
+        if not self.is_available():
+            return [self._unavailable_result(article) for article in articles]
+        if not articles:
+            return []
+
+        # Batch request ids must be unique, so repeated articles share one request
+        by_id = {article['id']: article for article in articles}
+        article_ids = list(by_id)
+        results = {}
 
         try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1024,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-
-            # Parse the response
-            response_text = response.content[0].text
-
-            # Try to extract JSON from response
-            import json
-            import re
-
-            # Find JSON in response
-            json_match = re.search(r'\{[\s\S]*\}', response_text)
-            if json_match:
-                result = json.loads(json_match.group())
-                return {
-                    "tldr": result.get('tldr', summary[:200]),
-                    "impacted_stocks": result.get('impacted_stocks', []),
-                    "analysis": "Success"
-                }
-            else:
-                return {
-                    "tldr": summary[:200] if summary else title[:200],
-                    "impacted_stocks": [],
-                    "analysis": "Could not parse response"
-                }
+            pending = {}
+            for start in range(0, len(article_ids), batch_size):
+                chunk = article_ids[start:start + batch_size]
+                batch = self.client.messages.batches.create(requests=[
+                    {"custom_id": article_id, "params": self._request_params(by_id[article_id])}
+                    for article_id in chunk
+                ])
+                pending[batch.id] = chunk
+                logger.info(f"Submitted message batch {batch.id} with {len(chunk)} requests")
+
+            deadline = time.monotonic() + timeout
+            ended = []
+            while pending:
+                for batch_id in list(pending):
+                    batch = self.client.messages.batches.retrieve(batch_id)
+                    if batch.processing_status == "ended":
+                        ended.append(batch_id)
+                        del pending[batch_id]
+
+                if not pending:
+                    break
+                if time.monotonic() >= deadline:
+                    # Unfinished requests are reported as timed out below
+                    for batch_id, chunk in pending.items():
+                        logger.warning(f"Message batch {batch_id} not done after {timeout}s, cancelling")
+                        try:
+                            self.client.messages.batches.cancel(batch_id)
+                        except Exception as e:
+                            logger.error(f"Error cancelling message batch {batch_id}: {e}")
+                        for article_id in chunk:
+                            results[article_id] = self._error_result(by_id[article_id], "Batch timed out")
+                    break
+
+                time.sleep(BATCH_POLL_INTERVAL)
+
+            for batch_id in ended:
+                for entry in self.client.messages.batches.results(batch_id):
+                    article = by_id.get(entry.custom_id)
+                    if article is None:
+                        continue
+
+                    # errored, canceled and expired requests carry no message
+                    if entry.result.type != "succeeded":
+                        results[entry.custom_id] = self._error_result(article, entry.result.type)
+                        continue
+
+                    try:
+                        results[entry.custom_id] = self._parse_response(
+                            article, entry.result.message.content[0].text
+                        )
+                    except Exception as e:
+                        logger.error(f"Stock tagging error: {e}")
+                        results[entry.custom_id] = self._error_result(article, e)
 
         except Exception as e:
-            logger.error(f"Stock tagging error: {e}")
-            return {
-                "tldr": summary[:200] if summary else title[:200],
-                "impacted_stocks": [],
-                "analysis": f"Error: {str(e)}"
-            }
+            logger.error(f"Message batch error: {e}")
+            return [results.get(article['id']) or self._error_result(article, e) for article in articles]
+
+        return [
+            results.get(article['id']) or self._error_result(article, "No result in batch")
+            for article in articles
+        ]
+
+    def _build_group_prompt(self, articles: list[dict]) -> str:
+        """Build one tagging prompt covering several articles, numbered from 1."""
+        articles_text = "\n\n".join(
+            f"[{i}]\n{_article_fields(article)}" for i, article in enumerate(articles, 1)
+        )
+
+        return self._group_prompt_prefix + f"""{articles_text}
+
+For each article, provide:
+{_PROMPT_INSTRUCTIONS}
+
+Respond with a JSON array containing one object per article, using the article's number as its id, in this exact format:
+[
+    {{
+        "id": 1,
+        "tldr": "Your 1-2 sentence TLDR summary here",
+        "impacted_stocks": [
+            {{"ticker": "MSFT", "reason": "Microsoft's Copilot competes directly with this new AI feature"}}
+        ]
+    }}
+]
+
+{_PROMPT_RULES}"""
+
+    def _parse_group_response(self, articles: list[dict], response_text: str) -> list[dict]:
+        """Parse Claude's JSON array response into tagging results, in article order."""
+        json_match = _JSON_ARRAY_RE.search(response_text)
+        if not json_match:
+            return [self._error_result(article, "Could not parse response") for article in articles]
+
+        by_index = {}
+        for item in orjson.loads(json_match.group()):
+            if isinstance(item, dict) and isinstance(item.get('id'), int):
+                by_index[item['id']] = item
+
+        results = []
+        for i, article in enumerate(articles, 1):
+            item = by_index.get(i)
+            if item is None:
+                results.append(self._error_result(article, "Missing from grouped response"))
+                continue
+            results.append({
+                "tldr": item.get('tldr', self._fallback_tldr(article)),
+                "impacted_stocks": item.get('impacted_stocks', []),
+                "analysis": "Success"
+            })
+        return results
+
+    def _group_request_params(self, group: list[dict]) -> dict:
+        """Build the Messages API parameters for tagging a group of articles."""
+        return {
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": GROUP_TOKENS_PER_ARTICLE * len(group),
+            "messages": [
+                {"role": "user", "content": self._build_group_prompt(group)}
+            ]
+        }
+
+    def tag_articles_grouped(self, articles: list[dict], group_size: int = GROUP_SIZE) -> list[dict]:
+        """
+        Tag articles several at a time, one API call per group.
+
+        The stocks context is sent once per group instead of once per article,
+        cutting round-trips and prompt tokens roughly by the group size.
+
+        Args:
+            articles: List of article dicts
+            group_size: Maximum articles per request
+
+        Returns:
+            Tagging results in the same order as articles
+        """
+        if not self.is_available():
+            return [self._unavailable_result(article) for article in articles]
+
+        results = []
+
+        for start in range(0, len(articles), group_size):
+            # Add delay between API calls to avoid rate limiting
+            if start > 0:
+                time.sleep(API_CALL_DELAY)
+
+            group = articles[start:start + group_size]
+            try:
+                response = self.client.messages.create(**self._group_request_params(group))
+                results.extend(self._parse_group_response(group, response.content[0].text))
+
+            except Exception as e:
+                logger.error(f"Stock tagging error: {e}")
+                results.extend(self._error_result(article, e) for article in group)
+
+        return results
+
+    async def tag_articles_grouped_async(self, articles: list[dict], group_size: int = GROUP_SIZE,
+                                         concurrency: int = MAX_CONCURRENT_REQUESTS) -> list[dict]:
+        """
+        Tag articles in groups, with the group requests in flight concurrently.
+
+        Args:
+            articles: List of article dicts
+            group_size: Maximum articles per request
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            Tagging results in the same order as articles
+        """
+        if not self.is_available():
+            return [self._unavailable_result(article) for article in articles]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def tag_group(group):
+            async with semaphore:
+                try:
+                    response = await self._get_async_client().messages.create(**self._group_request_params(group))
+                    return self._parse_group_response(group, response.content[0].text)
+                except Exception as e:
+                    logger.error(f"Stock tagging error: {e}")
+                    return [self._error_result(article, e) for article in group]
+
+        groups = [articles[i:i + group_size] for i in range(0, len(articles), group_size)]
+        grouped_results = await asyncio.gather(*[tag_group(group) for group in groups])
+        return [result for group_results in grouped_results for result in group_results]
 
     def tag_articles(self, articles: list[dict]) -> list[dict]:
         """
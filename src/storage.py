@@ -1,9 +1,13 @@
-import json
 import logging
 import re
+import sqlite3
+from contextlib import closing
+from itertools import islice
 from pathlib import Path
-from typing import Optional
-from datetime import datetime, timedelta
+from typing import Iterator, Optional
+from datetime import datetime, timedelta, timezone
+
+import orjson
 
 from .parsers.base import Article
 
@@ -12,134 +16,385 @@ logger = logging.getLogger(__name__)
 # Number of days to keep articles
 MAX_ARTICLE_AGE_DAYS = 14
 
+# Rows written per executemany when updating tags
+TAG_BATCH_SIZE = 50
+
+# Articles joined with their stock tags, if any
+_SELECT_ARTICLES = """SELECT a.data, t.tldr, t.impacted_stocks
+    FROM articles a LEFT JOIN article_tags t ON t.id = a.id"""
+
 
 class Storage:
-    """JSON file storage handler for articles."""
+    """SQLite storage handler for articles."""
 
     def __init__(self, data_dir: str = "data/articles"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.data_dir / "articles.db"
+        # (data version, stats) from the last get_stats call
+        self._stats_cache: Optional[tuple[int, dict]] = None
+        self._init_db()
+        self._migrate_json_files()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the article database."""
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        """Create the article and stock tag tables if they don't exist."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                # WAL lets the web app read while the scheduler writes
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS articles (
+                        source TEXT NOT NULL,
+                        id TEXT NOT NULL,
+                        sort_key TEXT NOT NULL,
+                        scraped_at TEXT,
+                        data TEXT NOT NULL,
+                        minhash BLOB,
+                        PRIMARY KEY (source, id)
+                    )"""
+                )
+                # Databases created before signatures were kept lack the column
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+                if 'minhash' not in columns:
+                    conn.execute("ALTER TABLE articles ADD COLUMN minhash BLOB")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_id ON articles(id)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_time ON articles(sort_key DESC)")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_articles_source_time ON articles(source, sort_key DESC)"
+                )
+                # Bumped on every change to a source's articles
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS source_versions (
+                        source TEXT PRIMARY KEY,
+                        version INTEGER NOT NULL,
+                        inserts INTEGER NOT NULL DEFAULT 0
+                    )"""
+                )
+                # Bumped only by writes that add articles, so deletions leave it alone
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(source_versions)")}
+                if 'inserts' not in columns:
+                    conn.execute("ALTER TABLE source_versions ADD COLUMN inserts INTEGER NOT NULL DEFAULT 0")
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS article_tags (
+                        id TEXT PRIMARY KEY,
+                        tldr TEXT,
+                        impacted_stocks TEXT
+                    )"""
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error initializing {self.db_path}: {e}")
+
+    def _migrate_json_files(self):
+        """Import per-source JSON files left by older versions, then set them aside."""
+        for file_path in self.data_dir.glob("*.json"):
+            if file_path.name == "all_articles.json":
+                continue
+
+            try:
+                with open(file_path, 'rb') as f:
+                    article_dicts = orjson.loads(f.read())
+            except (orjson.JSONDecodeError, IOError) as e:
+                logger.error(f"Error migrating {file_path}: {e}")
+                continue
+
+            if self._insert_article_dicts(file_path.stem, article_dicts) is not None:
+                file_path.replace(file_path.with_suffix('.json.migrated'))
+                logger.info(f"Migrated {len(article_dicts)} articles from {file_path}")
+
+    def _row(self, source_name: str, article: dict) -> tuple:
+        """Build an articles table row for an article dictionary."""
+        return (source_name, article['id'], self._get_sort_key(article),
+                article.get('scraped_at'), orjson.dumps(article).decode())
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection, source_name: str, inserted: bool = False):
+        """Record that a source's articles changed, and whether articles were added."""
+        conn.execute(
+            """INSERT INTO source_versions (source, version, inserts) VALUES (?, 1, ?)
+               ON CONFLICT(source) DO UPDATE SET version = version + 1, inserts = inserts + excluded.inserts""",
+            (source_name, int(inserted))
+        )
+
+    def _insert_article_dicts(self, source_name: str, article_dicts: list[dict]) -> Optional[int]:
+        """
+        Store article dictionaries for a source.
+
+        Args:
+            source_name: Name of the source
+            article_dicts: Articles to store
+
+        Returns:
+            Number of articles stored, or None on error
+        """
+        article_dicts = [a for a in article_dicts if a.get('id')]
+        ids = {a['id'] for a in article_dicts}
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                inserted = conn.executemany(
+                    "INSERT OR IGNORE INTO articles (source, id, sort_key, scraped_at, data) VALUES (?, ?, ?, ?, ?)",
+                    [self._row(source_name, a) for a in article_dicts]
+                ).rowcount
+
+                if inserted > 0:
+                    self._bump_version(conn, source_name, inserted=True)
+
+            return len(ids)
+        except sqlite3.Error as e:
+            logger.error(f"Error saving articles for {source_name}: {e}")
+            return None
 
-    def _get_source_file(self, source_name: str) -> Path:
-        """Get the file path for a source's articles."""
-        return self.data_dir / f"{source_name}.json"
+    @staticmethod
+    def _with_tags(rows) -> Iterator[dict]:
+        """Decode (data, tldr, impacted_stocks) rows, overlaying any stored tags."""
+        for data, tldr, stocks in rows:
+            article = orjson.loads(data)
+            if stocks is not None:
+                article['tldr'] = tldr
+                article['impacted_stocks'] = orjson.loads(stocks)
+            yield article
+
+    @staticmethod
+    def _unique(articles: Iterator[dict]) -> Iterator[dict]:
+        """Drop repeats of an article stored under more than one source."""
+        seen_ids = set()
+        for article in articles:
+            if article['id'] not in seen_ids:
+                seen_ids.add(article['id'])
+                yield article
+
+    def _cutoff(self, days: int = MAX_ARTICLE_AGE_DAYS) -> str:
+        """Get the oldest sort key still within the date range."""
+        # Sort keys are naive UTC ISO strings, so compare against the same form
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        return cutoff.replace(tzinfo=None).isoformat()
+
+    def get_insert_count(self, source_name: str) -> Optional[int]:
+        """Get how many writes have added articles to a source, or None if it has never been saved."""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT inserts FROM source_versions WHERE source = ?", (source_name,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading version of {source_name}: {e}")
+            return None
+        return row[0] if row else None
 
-    def _get_combined_file(self) -> Path:
-        """Get the path for the combined articles file."""
-        return self.data_dir / "all_articles.json"
+    def get_data_version(self) -> Optional[int]:
+        """Get a number that changes whenever any source's articles change, or None if unavailable."""
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute("SELECT COALESCE(SUM(version), 0) FROM source_versions").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Error reading data version: {e}")
+            return None
 
     def load_articles(self, source_name: str) -> list[dict]:
         """Load articles for a specific source."""
-        file_path = self._get_source_file(source_name)
-
-        if not file_path.exists():
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT data FROM articles WHERE source = ? ORDER BY sort_key DESC", (source_name,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading articles for {source_name}: {e}")
             return []
+        return [orjson.loads(data) for data, in rows]
 
+    def load_urls(self, source_name: str) -> list[str]:
+        """Load the URLs of a source's stored articles."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            logger.error(f"Error loading {file_path}: {e}")
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT json_extract(data, '$.url') FROM articles WHERE source = ?", (source_name,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading URLs for {source_name}: {e}")
             return []
+        return [url for url, in rows if url]
+
+    def load_minhashes(self, source_name: str) -> tuple[list[tuple[str, bytes]], list[dict]]:
+        """
+        Load the near-duplicate signatures stored for a source's articles.
 
-    def save_articles(self, source_name: str, articles: list[Article]) -> int:
+        Returns:
+            Tuple of ((article id, signature) pairs, articles stored without a signature)
         """
-        Save articles for a specific source.
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT id, minhash, CASE WHEN minhash IS NULL THEN data END FROM articles WHERE source = ?",
+                    (source_name,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading signatures for {source_name}: {e}")
+            return [], []
+
+        signed = [(article_id, minhash) for article_id, minhash, _ in rows if minhash is not None]
+        unsigned = [orjson.loads(data) for _, minhash, data in rows if minhash is None]
+        return signed, unsigned
+
+    def set_minhashes(self, source_name: str, minhashes: list[tuple[str, bytes]]):
+        """
+        Store near-duplicate signatures for a source's articles.
+
+        Signatures are derived from the stored articles, so the source's
+        version is left as it is.
 
         Args:
             source_name: Name of the source
-            articles: List of Article objects to save
+            minhashes: List of (article_id, signature) tuples
+        """
+        if not minhashes:
+            return
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "UPDATE articles SET minhash = ? WHERE source = ? AND id = ?",
+                    [(minhash, source_name, article_id) for article_id, minhash in minhashes]
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error saving signatures for {source_name}: {e}")
+
+    def add_articles(self, source_name: str, articles: list[Article]) -> int:
+        """
+        Add new articles for a source, leaving its stored articles untouched.
+
+        Only the given articles are serialized and written, so the cost grows
+        with the number of new articles rather than the size of the source.
+
+        Args:
+            source_name: Name of the source
+            articles: List of new Article objects
 
         Returns:
-            Number of articles saved
+            Number of articles passed in that are now stored
+        """
+        return self.add_article_dicts(source_name, [a.to_dict() for a in articles])
+
+    def add_article_dicts(self, source_name: str, article_dicts: list[dict]) -> int:
+        """
+        Add new articles for a source from their dictionary form.
+
+        Lets callers that already hold each article's dict reuse it rather than
+        converting the articles again. The dicts are serialized before this
+        returns, so callers may go on to modify them.
+
+        Args:
+            source_name: Name of the source
+            article_dicts: List of new article dictionaries
+
+        Returns:
+            Number of articles passed in that are now stored
+        """
+        if not article_dicts:
+            return 0
+
+        added = self._insert_article_dicts(source_name, article_dicts)
+        if added is None:
+            return 0
+
+        logger.info(f"Added {added} articles for {source_name}")
+        return added
+
+    def update_article_tags(self, updates: list[tuple[str, str, list[dict]]]) -> int:
         """
-        file_path = self._get_source_file(source_name)
+        Store TLDRs and impacted stocks for articles.
 
-        # Convert to dictionaries
-        article_dicts = [a.to_dict() for a in articles]
+        Args:
+            updates: List of (article_id, tldr, impacted_stocks) tuples
+
+        Returns:
+            Number of articles updated
+        """
+        rows = [(article_id, tldr, orjson.dumps(stocks).decode()) for article_id, tldr, stocks in updates]
 
         try:
-            # Write atomically by writing to temp file first
-            temp_path = file_path.with_suffix('.tmp')
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(article_dicts, f, indent=2, ensure_ascii=False)
-            temp_path.replace(file_path)
-
-            logger.info(f"Saved {len(articles)} articles to {file_path}")
-            return len(articles)
-        except IOError as e:
-            logger.error(f"Error saving to {file_path}: {e}")
+            with closing(self._connect()) as conn:
+                for i in range(0, len(rows), TAG_BATCH_SIZE):
+                    with conn:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO article_tags (id, tldr, impacted_stocks) VALUES (?, ?, ?)",
+                            rows[i:i + TAG_BATCH_SIZE]
+                        )
+            logger.info(f"Updated tags for {len(rows)} articles")
+            return len(rows)
+        except sqlite3.Error as e:
+            logger.error(f"Error updating article tags: {e}")
             return 0
 
-    def load_all_articles(self) -> list[dict]:
-        """Load all articles from all sources."""
-        combined_file = self._get_combined_file()
+    def _iter_articles(self, where: str = "", params: tuple = (), limit: Optional[int] = None) -> Iterator[dict]:
+        """
+        Yield tagged articles matching a WHERE clause, newest first, without repeats.
 
-        if combined_file.exists():
-            try:
-                with open(combined_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                logger.error(f"Error loading combined file: {e}")
+        Rows are read and decoded as the caller iterates, and the connection
+        stays open until the iterator is exhausted or closed.
+        """
+        sql = f"{_SELECT_ARTICLES} {where} ORDER BY a.sort_key DESC"
 
-        # Fallback: load from individual files
-        all_articles = []
-        for file_path in self.data_dir.glob("*.json"):
-            if file_path.name != "all_articles.json":
-                articles = self.load_articles(file_path.stem)
-                all_articles.extend(articles)
+        try:
+            with closing(self._connect()) as conn:
+                yield from islice(self._unique(self._with_tags(conn.execute(sql, params))), limit)
+        except sqlite3.Error as e:
+            logger.error(f"Error querying articles: {e}")
 
-        return all_articles
+    def _query_articles(self, where: str = "", params: tuple = (), limit: Optional[int] = None) -> list[dict]:
+        """Load tagged articles matching a WHERE clause, newest first, without repeats."""
+        return list(self._iter_articles(where, params, limit))
 
-    def update_combined_file(self) -> int:
+    def load_all_articles(self) -> list[dict]:
+        """Load all articles within the date range from all sources, newest first."""
+        return self._query_articles("WHERE a.sort_key >= ?", (self._cutoff(),))
+
+    def count_articles(self) -> int:
+        """Count distinct articles within the date range across all sources."""
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute(
+                    "SELECT COUNT(DISTINCT id) FROM articles WHERE sort_key >= ?", (self._cutoff(),)
+                ).fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Error counting articles: {e}")
+            return 0
+
+    def export_json(self, path: Optional[str] = None) -> int:
         """
-        Update the combined articles file from all source files.
+        Write all articles within the date range to a JSON file, newest first.
+
+        Args:
+            path: Output file, defaults to all_articles.json in the data directory
 
         Returns:
-            Total number of articles in combined file
+            Number of articles written
         """
-        all_articles = []
-        seen_ids = set()
-
-        for file_path in self.data_dir.glob("*.json"):
-            if file_path.name == "all_articles.json":
-                continue
+        export_path = Path(path) if path else self.data_dir / "all_articles.json"
+        articles = self._query_articles("WHERE a.sort_key >= ?", (self._cutoff(),))
+        for article in articles:
+            article.pop('tldr', None)
+            article.pop('impacted_stocks', None)
 
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    articles = json.load(f)
-                    for article in articles:
-                        article_id = article.get('id')
-                        if article_id and article_id not in seen_ids:
-                            all_articles.append(article)
-                            seen_ids.add(article_id)
-            except (json.JSONDecodeError, IOError) as e:
-                logger.error(f"Error reading {file_path}: {e}")
-
-        # Filter to only articles within last 2 weeks with valid dates
-        all_articles = [a for a in all_articles if self._is_within_date_range(a)]
-
-        # Sort by date (newest first) using parsed dates
-        all_articles.sort(key=self._get_sort_key, reverse=True)
-
-        # Save combined file
-        combined_file = self._get_combined_file()
         try:
-            with open(combined_file, 'w', encoding='utf-8') as f:
-                json.dump(all_articles, f, indent=2, ensure_ascii=False)
-            logger.info(f"Updated combined file with {len(all_articles)} articles")
+            temp_path = export_path.with_suffix('.tmp')
+            with open(temp_path, 'wb') as f:
+                f.write(orjson.dumps(articles, option=orjson.OPT_INDENT_2))
+            temp_path.replace(export_path)
+            logger.info(f"Exported {len(articles)} articles to {export_path}")
         except IOError as e:
-            logger.error(f"Error saving combined file: {e}")
+            logger.error(f"Error exporting to {export_path}: {e}")
+            return 0
 
-        return len(all_articles)
+        return len(articles)
 
     def get_article_by_id(self, article_id: str) -> Optional[dict]:
         """Get a single article by its ID."""
-        articles = self.load_all_articles()
-        for article in articles:
-            if article.get('id') == article_id:
-                return article
-        return None
+        articles = self._query_articles("WHERE a.id = ?", (article_id,), limit=1)
+        return articles[0] if articles else None
 
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse a date string into a datetime object."""
@@ -175,55 +430,29 @@ class Storage:
 
         return None
 
-    def _is_within_date_range(self, article: dict, days: int = MAX_ARTICLE_AGE_DAYS) -> bool:
-        """Check if article is within the specified date range."""
-        date_str = article.get('published_date') or article.get('scraped_at')
-        if not date_str:
-            return False
-
-        parsed_date = self._parse_date(date_str)
-        if not parsed_date:
-            return False
-
-        cutoff = datetime.utcnow() - timedelta(days=days)
-        return parsed_date >= cutoff
-
-    def _has_valid_date(self, article: dict) -> bool:
-        """Check if article has a valid date within the last 2 weeks."""
-        date = article.get('published_date') or article.get('scraped_at')
-        if not date:
-            return False
-        # Check it's not a placeholder or invalid
-        if date == '1970-01-01' or str(date).startswith('1970'):
-            return False
-        # Check it's within the date range
-        return self._is_within_date_range(article)
-
     def _get_sort_key(self, article: dict) -> str:
         """Get a sortable date key for an article."""
-        date_str = article.get('published_date') or article.get('scraped_at') or ''
-        parsed = self._parse_date(date_str)
+        # Parsers pass some published dates through unparsed; fall back to when
+        # the article was scraped so cleanup doesn't treat it as ancient
+        parsed = (self._parse_date(article.get('published_date') or '')
+                  or self._parse_date(article.get('scraped_at') or ''))
         if parsed:
             return parsed.isoformat()
         return '1970-01-01'
 
     def get_articles_by_source(self, source_name: str, limit: int = 50) -> list[dict]:
         """Get articles from a specific source, sorted by date (newest first). Only includes articles from last 2 weeks."""
-        articles = self.load_articles(source_name)
-        # Filter to only articles with valid dates within last 2 weeks
-        articles = [a for a in articles if self._has_valid_date(a)]
-        # Sort by date (newest first) using parsed dates
-        articles.sort(key=self._get_sort_key, reverse=True)
-        return articles[:limit]
+        return self._query_articles(
+            "WHERE a.source = ? AND a.sort_key >= ?", (source_name, self._cutoff()), limit=limit
+        )
+
+    def iter_recent_articles(self, limit: int = 50) -> Iterator[dict]:
+        """Yield most recent articles across all sources, newest first. Only includes articles from last 2 weeks."""
+        return self._iter_articles("WHERE a.sort_key >= ?", (self._cutoff(),), limit=limit)
 
     def get_recent_articles(self, limit: int = 50) -> list[dict]:
         """Get most recent articles across all sources, sorted by date (newest first). Only includes articles from last 2 weeks."""
-        articles = self.load_all_articles()
-        # Filter to only articles with valid dates within last 2 weeks
-        articles = [a for a in articles if self._has_valid_date(a)]
-        # Sort by date (newest first) using parsed dates
-        articles.sort(key=self._get_sort_key, reverse=True)
-        return articles[:limit]
+        return list(self.iter_recent_articles(limit))
 
     def cleanup_old_articles(self, days: int = 14) -> int:
         """
@@ -235,72 +464,64 @@ class Storage:
         Returns:
             Number of articles removed
         """
-        from datetime import datetime, timedelta
-
-        cutoff_date = (datetime.utcnow() - timedelta(days=days)).isoformat() + "Z"
+        cutoff = self._cutoff(days)
         total_removed = 0
 
-        for file_path in self.data_dir.glob("*.json"):
-            if file_path.name == "all_articles.json":
-                continue
-
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    articles = json.load(f)
-
-                original_count = len(articles)
-
-                # Filter to keep only recent articles
-                articles = [
-                    a for a in articles
-                    if (a.get('published_date') or a.get('scraped_at', '')) > cutoff_date
-                ]
-
-                removed = original_count - len(articles)
-                total_removed += removed
-
-                if removed > 0:
-                    # Save filtered articles
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(articles, f, indent=2, ensure_ascii=False)
-                    logger.info(f"Removed {removed} old articles from {file_path.stem}")
-
-            except (json.JSONDecodeError, IOError) as e:
-                logger.error(f"Error cleaning {file_path}: {e}")
-
-        # Update combined file after cleanup
-        if total_removed > 0:
-            self.update_combined_file()
+        try:
+            with closing(self._connect()) as conn, conn:
+                removed_by_source = conn.execute(
+                    "SELECT source, COUNT(*) FROM articles WHERE sort_key < ? GROUP BY source", (cutoff,)
+                ).fetchall()
+                conn.execute("DELETE FROM articles WHERE sort_key < ?", (cutoff,))
+
+                for source_name, removed in removed_by_source:
+                    self._bump_version(conn, source_name)
+                    total_removed += removed
+                    logger.info(f"Removed {removed} old articles from {source_name}")
+        except sqlite3.Error as e:
+            logger.error(f"Error cleaning old articles: {e}")
+            return 0
 
         logger.info(f"Cleanup complete. Removed {total_removed} articles older than {days} days.")
         return total_removed
 
     def get_stats(self) -> dict:
-        """Get storage statistics."""
+        """Get storage statistics, recomputed only after the stored articles change."""
+        version = self.get_data_version()
+        cached = self._stats_cache
+        if cached is None or version is None or cached[0] != version:
+            try:
+                stats = self._compute_stats()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading stats: {e}")
+                return {"total_articles": 0, "sources": {}, "last_updated": None}
+            if version is not None:
+                self._stats_cache = (version, stats)
+        else:
+            stats = cached[1]
+
+        # Callers get their own copy so the cached dict can't be modified
+        return {**stats, "sources": dict(stats["sources"])}
+
+    def _compute_stats(self) -> dict:
+        """Count articles per source and find the latest scrape time."""
         stats = {
             "total_articles": 0,
             "sources": {},
             "last_updated": None
         }
 
-        for file_path in self.data_dir.glob("*.json"):
-            if file_path.name == "all_articles.json":
-                continue
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT source, COUNT(*), MAX(scraped_at) FROM articles GROUP BY source"
+            ).fetchall()
 
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    articles = json.load(f)
-                    source_name = file_path.stem
-                    count = len(articles)
-                    stats["sources"][source_name] = count
-                    stats["total_articles"] += count
-
-                    # Track most recent update
-                    if articles:
-                        latest = max(a.get('scraped_at', '') for a in articles)
-                        if not stats["last_updated"] or latest > stats["last_updated"]:
-                            stats["last_updated"] = latest
-            except (json.JSONDecodeError, IOError):
-                continue
+        for source_name, count, latest in rows:
+            stats["sources"][source_name] = count
+            stats["total_articles"] += count
+
+            # Track most recent update
+            if latest and (not stats["last_updated"] or latest > stats["last_updated"]):
+                stats["last_updated"] = latest
 
         return stats
@@ -0,0 +1,40 @@
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only record where a click came from
+_TRACK_RE = re.compile(r'^(utm_.*|fbclid|gclid|ref|source)$', re.IGNORECASE)
+
+
+@lru_cache(maxsize=200_000)
+def normalize(url: str) -> str:
+    """
+    Normalize a URL for duplicate detection.
+
+    Lowercases the scheme and host, drops the fragment and tracking query
+    parameters, and removes any trailing slash from the path.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL, or the input unchanged if it can't be parsed
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACK_RE.match(key)
+    ])
+
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip('/'),
+        query,
+        ''
+    ))
@@ -0,0 +1,31 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+# libyaml's C loader when PyYAML was built with it, otherwise the pure-Python one
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@lru_cache(maxsize=16)
+def _load(path: str, mtime_ns: int) -> Any:
+    """Parse a YAML file; the modification time is only part of the cache key."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_Loader)
+
+
+def load_yaml(path: Path) -> Any:
+    """
+    Load a YAML file, reusing the parsed result until the file changes.
+
+    The result is shared between callers, so treat it as read-only.
+
+    Args:
+        path: YAML file to load
+
+    Returns:
+        Parsed YAML document
+    """
+    return _load(str(path), os.stat(path).st_mtime_ns)
@@ -0,0 +1,31 @@
+import tempfile
+import unittest
+
+from src.parsers.base import Article
+from src.storage import Storage
+
+
+class UnparseableDateTest(unittest.TestCase):
+    """Articles whose published date can't be parsed are kept by cleanup."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = Storage(data_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cleanup_keeps_recently_scraped_article(self):
+        article = Article.create(
+            title="Post", url="https://x.com/a", source="blog", source_name="Blog",
+            published_date="Jan. 5, 2026"
+        )
+        self.storage.add_articles("blog", [article])
+
+        self.assertEqual(self.storage.cleanup_old_articles(), 0)
+        self.assertEqual(self.storage.load_articles("blog")[0]["url"], "https://x.com/a")
+        self.assertEqual(self.storage.get_recent_articles()[0]["id"], article.id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,20 @@
+import asyncio
+import logging
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+import orjson
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.requests import Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from pydantic import BaseModel
 from typing import Optional
 
@@ -17,14 +22,49 @@ from src.storage import Storage
 from src.ai_search import AISearch
 from src.scraper import Scraper
 from src.deduplicator import Deduplicator
+from src.scheduler import NewsScheduler
+
+logger = logging.getLogger(__name__)
+
+# Run the scrape schedule on the server's event loop. Off by default, since
+# the scheduler normally runs as its own service.
+WEB_SCHEDULER_ENABLED = os.getenv('WEB_SCHEDULER_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+
+# Keep references to running scrape tasks so they aren't garbage collected
+_scrape_tasks: set[asyncio.Task] = set()
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop the in-process scheduler, if enabled."""
+    # Setup loads configs and opens caches, so keep it off the event loop
+    scheduler = await asyncio.to_thread(NewsScheduler) if WEB_SCHEDULER_ENABLED else None
+    if scheduler:
+        scheduler.start_background()
+    yield
+    if scheduler:
+        scheduler.stop()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="AI News Scraper",
     description="Scrape and search AI news with Claude-powered insights",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Article listings are mostly text and compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Mount static files
 static_path = Path(__file__).parent / "static"
 static_path.mkdir(exist_ok=True)
@@ -128,23 +168,38 @@ async def search_articles(request: SearchRequest):
 
 
 @app.post("/api/scrape")
-async def trigger_scrape(background_tasks: BackgroundTasks):
+async def trigger_scrape():
     """Trigger a manual scrape of all sources."""
 
-    def do_scrape():
-        scraper = Scraper()
+    async def do_scrape():
+        # Setup loads configs and opens caches, so keep it off the event loop
+        scraper = await asyncio.to_thread(Scraper)
         deduplicator = Deduplicator(storage)
 
-        results = scraper.scrape_all()
+        results = await scraper.scrape_all_async()
+
+        def save_results():
+            for source_name, articles in results.items():
+                if articles:
+                    new_articles = deduplicator.filter_new_articles(source_name, articles)
+                    storage.add_articles(source_name, new_articles)
+                    deduplicator.record_stored(source_name, new_articles)
+
+            # Everything scraped is stored, so unchanged pages can be skipped next run
+            scraper.commit_validators()
 
-        for source_name, articles in results.items():
-            if articles:
-                merged = deduplicator.merge_articles(source_name, articles)
-                storage.save_articles(source_name, merged)
+        # Storage writes block, so keep them off the event loop
+        await asyncio.to_thread(save_results)
 
-        storage.update_combined_file()
+    def scrape_done(task: asyncio.Task):
+        _scrape_tasks.discard(task)
+        # Nothing awaits the task, so report its failure here
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background scrape failed", exc_info=task.exception())
 
-    background_tasks.add_task(do_scrape)
+    task = asyncio.create_task(do_scrape())
+    _scrape_tasks.add(task)
+    task.add_done_callback(scrape_done)
 
     return {
         "status": "started",
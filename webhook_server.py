@@ -6,84 +6,335 @@ Listens for push events and runs deploy.sh
 
 import subprocess
 import hmac
-import hashlib
+import logging
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
-import json
+import queue
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from logging.handlers import QueueHandler, QueueListener
+import orjson
+
+logger = logging.getLogger(__name__)
 
 WEBHOOK_SECRET = os.getenv('GITHUB_WEBHOOK_SECRET', 'your-secret-here')
+_SECRET_BYTES = WEBHOOK_SECRET.encode()
+
+# Unsigned deliveries are only let through while the placeholder secret is in use
+_SKIP_VERIFICATION = WEBHOOK_SECRET == 'your-secret-here'
+
+# HMAC keyed with the secret once; copies of it skip the per-request key setup
+_HMAC_TEMPLATE = hmac.new(_SECRET_BYTES, digestmod='sha256')
 DEPLOY_SCRIPT = '/opt/ai-news-scraper/deploy.sh'
 PORT = 9000
 
+# Connections handled at once; further ones wait for a free worker
+MAX_WORKERS = 8
+
+# Seconds a connection, kept open between requests, may sit idle before
+# it's dropped, freeing its worker
+REQUEST_TIMEOUT = 10
+
+# Request bodies are read and hashed this many bytes at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# Recent delivery IDs remembered, so GitHub's redeliveries aren't handled twice
+DELIVERY_CACHE_SIZE = 512
+
+# Length of a well-formed X-Hub-Signature-256 header: the prefix plus 64 hex digits
+SIGNATURE_PREFIX = 'sha256='
+SIGNATURE_LENGTH = len(SIGNATURE_PREFIX) + 64
+
+# A "ref" key with a plain string value, matched on the raw payload bytes
+_REF_RE = re.compile(rb'"ref"\s*:\s*"([^"\\]*)"')
+
+# Complete responses for the fixed replies, keyed by (status, body), so the
+# common answers are written as is rather than assembled header by header
+_CANNED_RESPONSES = {
+    (code, body): b'HTTP/1.1 %d %s\r\nContent-Length: %d\r\n\r\n%s' % (
+        code, HTTPStatus(code).phrase.encode(), len(body), body)
+    for code, body in [
+        (200, b'Ignored (not main branch)'),
+        (200, b'Duplicate delivery'),
+        (202, b'Deploy queued'),
+        (403, b'Invalid signature'),
+    ]
+}
+
+
+def extract_ref(payload, event):
+    """
+    Get the ref a webhook payload refers to.
+
+    Push payloads have a single "ref" key, at the top level, so for those the
+    value is read straight from the raw bytes; anything else is parsed in full.
+    """
+    if event == 'push':
+        matches = _REF_RE.findall(payload)
+        if len(matches) == 1:
+            return matches[0].decode()
+
+    return orjson.loads(payload).get('ref', '')
+
+
+class Deployer:
+    """Runs deploy.sh in the background, one deploy at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+
+    def request(self) -> bool:
+        """
+        Start a deploy, or queue one more run if a deploy is already going.
+
+        Pushes that arrive during a deploy are coalesced into a single rerun,
+        which picks up everything pushed so far.
+
+        Returns:
+            True if a new deploy was started, False if it was queued
+        """
+        with self._lock:
+            if self._running:
+                self._pending = True
+                return False
+            self._running = True
+
+        threading.Thread(target=self._run, name='deploy').start()
+        return True
+
+    def _run(self):
+        """Run deploys until no rerun is pending."""
+        while True:
+            try:
+                logger.info("Deploying...")
+
+                # The script writes straight to our stdout and stderr, so its
+                # output isn't piped back through Python or decoded
+                result = subprocess.run([DEPLOY_SCRIPT])
+                logger.info("Deploy finished with exit code %d", result.returncode)
+            except Exception as e:
+                logger.error("Deploy failed: %s", e)
+
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+
+
+class DeliveryCache:
+    """Remembers recently handled deliveries by their X-GitHub-Delivery ID."""
+
+    def __init__(self, maxsize: int = DELIVERY_CACHE_SIZE):
+        self._maxsize = maxsize
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, delivery_id: str, content_length: int) -> bool:
+        """Check whether a delivery with this ID and body length was already handled."""
+        with self._lock:
+            if self._seen.get(delivery_id) != content_length:
+                return False
+            self._seen.move_to_end(delivery_id)
+            return True
+
+    def add(self, delivery_id: str, content_length: int):
+        """Record a handled delivery, forgetting the oldest one when full."""
+        with self._lock:
+            self._seen[delivery_id] = content_length
+            self._seen.move_to_end(delivery_id)
+            if len(self._seen) > self._maxsize:
+                self._seen.popitem(last=False)
+
+
+deployer = Deployer()
+deliveries = DeliveryCache()
+
 
 class WebhookHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open, so later deliveries skip the handshake
+    protocol_version = 'HTTP/1.1'
+    timeout = REQUEST_TIMEOUT
+
+    # Buffer responses so the status line, headers and body go out in one write
+    wbufsize = -1
+
     def do_POST(self):
+        content_length = int(self.headers.get('Content-Length', 0))
+
+        # Only Content-Length bodies are read; anything else can't be told
+        # apart from the next request, so the connection is closed after this one
+        if 'Transfer-Encoding' in self.headers:
+            self.close_connection = True
+
         if self.path != '/webhook':
-            self.send_response(404)
-            self.end_headers()
+            self.skip_payload(content_length)
+            self.respond(404)
             return
 
-        content_length = int(self.headers.get('Content-Length', 0))
-        payload = self.rfile.read(content_length)
+        # A redelivery of something already handled gets the same answer,
+        # without hashing or parsing it again
+        delivery_id = self.headers.get('X-GitHub-Delivery')
+        if delivery_id and deliveries.seen(delivery_id, content_length):
+            logger.info("Duplicate delivery %s, ignoring...", delivery_id)
+            self.skip_payload(content_length)
+            self.respond(200, b'Duplicate delivery')
+            return
 
-        # Verify signature
+        # Turn away a malformed signature before hashing the body for it
         signature = self.headers.get('X-Hub-Signature-256', '')
-        if not self.verify_signature(payload, signature):
-            print("Invalid signature!")
-            self.send_response(403)
-            self.end_headers()
-            self.wfile.write(b'Invalid signature')
+        if signature and (not signature.startswith(SIGNATURE_PREFIX)
+                          or len(signature) != SIGNATURE_LENGTH):
+            logger.warning("Invalid signature!")
+            self.skip_payload(content_length)
+            self.respond(403, b'Invalid signature')
+            return
+
+        payload, digest = self.read_payload(content_length)
+
+        # Verify signature
+        if not self.verify_signature(digest, signature):
+            logger.warning("Invalid signature!")
+            self.respond(403, b'Invalid signature')
             return
 
         # Parse payload
         try:
-            data = json.loads(payload)
-            ref = data.get('ref', '')
+            ref = extract_ref(payload, self.headers.get('X-GitHub-Event'))
 
             # Only deploy on push to main branch
             if ref == 'refs/heads/main':
-                print("Push to main detected! Deploying...")
-                result = subprocess.run(
-                    [DEPLOY_SCRIPT],
-                    capture_output=True,
-                    text=True
-                )
-                print(f"Deploy output: {result.stdout}")
-                if result.stderr:
-                    print(f"Deploy errors: {result.stderr}")
-
-                self.send_response(200)
-                self.end_headers()
-                self.wfile.write(b'Deployed successfully!')
+                # Answer straight away; GitHub gives up on deliveries after 10 seconds
+                if deployer.request():
+                    logger.info("Push to main detected! Deploy started")
+                else:
+                    logger.info("Push to main detected! Deploy queued behind the running one")
+
+                self.respond(202, b'Deploy queued')
             else:
-                print(f"Push to {ref}, ignoring...")
-                self.send_response(200)
-                self.end_headers()
-                self.wfile.write(b'Ignored (not main branch)')
+                logger.info("Push to %s, ignoring...", ref)
+                self.respond(200, b'Ignored (not main branch)')
+
+            if delivery_id:
+                deliveries.add(delivery_id, content_length)
 
         except Exception as e:
-            print(f"Error: {e}")
-            self.send_response(500)
-            self.end_headers()
-            self.wfile.write(str(e).encode())
+            logger.error("Error: %s", e)
+            self.respond(500, str(e).encode())
+
+    def respond(self, code, body=b''):
+        """Send a response with the given status code and body."""
+        response = _CANNED_RESPONSES.get((code, body))
+        if response is not None and not self.close_connection:
+            self.log_request(code)
+            self.wfile.write(response)
+            return
+
+        self.send_response(code)
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
 
-    def verify_signature(self, payload, signature):
+    def read_payload(self, content_length):
+        """
+        Read the request body, feeding it to the HMAC as each chunk arrives.
+
+        Returns:
+            Tuple of (body, HMAC-SHA256 digest of the body)
+        """
+        mac = _HMAC_TEMPLATE.copy()
+        chunks = []
+        remaining = content_length
+
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            mac.update(chunk)
+            chunks.append(chunk)
+            remaining -= len(chunk)
+
+        return b''.join(chunks), mac.digest()
+
+    def skip_payload(self, content_length):
+        """Read and discard the request body."""
+        remaining = content_length
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+    def verify_signature(self, digest, signature):
         if not signature or not WEBHOOK_SECRET:
-            return WEBHOOK_SECRET == 'your-secret-here'  # Skip verification if no secret
+            return _SKIP_VERIFICATION  # Skip verification if no secret
 
-        expected = 'sha256=' + hmac.new(
-            WEBHOOK_SECRET.encode(),
-            payload,
-            hashlib.sha256
-        ).hexdigest()
+        # Compare raw digests rather than their hex forms
+        if not signature.startswith(SIGNATURE_PREFIX):
+            return False
+        try:
+            signature_bytes = bytes.fromhex(signature[len(SIGNATURE_PREFIX):])
+        except ValueError:
+            return False
 
-        return hmac.compare_digest(expected, signature)
+        return hmac.compare_digest(digest, signature_bytes)
 
     def log_message(self, format, *args):
-        print(f"[Webhook] {args[0]}")
+        logger.info(format, *args)
+
+
+class WebhookServer(ThreadingHTTPServer):
+    """HTTP server that handles connections on a fixed pool of worker threads."""
+
+    def __init__(self, server_address, handler_class, max_workers=MAX_WORKERS):
+        super().__init__(server_address, handler_class)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='webhook')
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+def setup_logging() -> QueueListener:
+    """
+    Send log records through a queue to a background thread that writes them.
+
+    Request threads only enqueue records, so a slow stdout or journal never
+    holds up a webhook response.
+
+    Returns:
+        The started listener; stop it to flush remaining records
+    """
+    log_queue = queue.SimpleQueue()
+
+    # Records are formatted before they're queued, so the writer prints them as is
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(log_queue)]
+    )
+    listener = QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    return listener
 
 
 if __name__ == '__main__':
-    print(f"Starting webhook server on port {PORT}...")
-    server = HTTPServer(('0.0.0.0', PORT), WebhookHandler)
-    server.serve_forever()
+    listener = setup_logging()
+    logger.info("Starting webhook server on port %d...", PORT)
+    # Connections run on worker threads, so a slow client doesn't hold up
+    # other deliveries, and a flood of them can't spawn unbounded threads
+    server = WebhookServer(('0.0.0.0', PORT), WebhookHandler)
+    try:
+        server.serve_forever()
+    finally:
+        listener.stop()